@@ -1,34 +1,220 @@
-import pandas as pd
-csv_file_name = input("Enter File Name : ")
-# CSV file load karo
-df = pd.read_csv(csv_file_name)
+import os
+import sys
+import csv
+import heapq
+import argparse
+import tempfile
 
-# Total rows
-total_urls = len(df)
+# job_ids.py / job_ledger.py live next to the bots in Don't_Touch
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(FOLDER), "Don't_Touch"))
+from job_ids import job_key
+from job_ledger import STATUS_FILES, STATUS_RANK
 
-# Unique rows
-unique_urls = df['URL'].nunique()
+# ===============================
+# 🔹 SETTINGS
+# ===============================
 
-# Duplicate rows
-duplicate_count = total_urls - unique_urls
+# A job found in several files is kept only in the strongest one
+# (success > already applied > company site > expired > manual > skipped)
+FILE_RANK = {file_name: STATUS_RANK[status] for status, file_name in STATUS_FILES.items()}
+OTHER_FILE_RANK = -1
 
-# Duplicate list
-duplicates = df[df.duplicated(subset=['URL'], keep=False)]
+# Winners kept in memory before they are spilled to a sorted run on disk
+MAX_KEYS_IN_MEMORY = 500_000
 
-# ===== SUMMARY =====
-print("===== SUMMARY =====")
-print(f"Total URLs       : {total_urls}")
-print(f"Unique URLs      : {unique_urls}")
-print(f"Duplicate Count  : {duplicate_count}")
+LINK_HEADERS = ("Link", "URL")
+LINK_COLUMN = 3   # Company Name, Experience, Location, Link
 
-if duplicate_count > 0:
-    print("\nDuplicate URLs:")
-    print(duplicates['URL'].to_string(index=False))
-else:
-    print("\nNo duplicates found ✅")
+# ===============================
+# 🔹 READING
+# ===============================
 
-# ===== REMOVE DUPLICATES & UPDATE SAME FILE =====
-df = df.drop_duplicates(subset=['URL'])
-df.to_csv(csv_file_name, index=False)
+def _link_column(header):
+    """Index of the link column from the header row, or None if the first row is data."""
+    if any(cell.strip().startswith("http") for cell in header):
+        return None
+    for name in LINK_HEADERS:
+        if name in [cell.strip() for cell in header]:
+            return [cell.strip() for cell in header].index(name)
+    return LINK_COLUMN
 
-print("\n✅ Duplicates removed. File '{csv_file_name}' updated successfully.")
+def _row_link(row, column):
+    if len(row) > column and row[column].strip().startswith("http"):
+        return row[column].strip()
+    for cell in row:
+        if cell.strip().startswith("http"):
+            return cell.strip()
+    return None
+
+def iter_keyed_rows(path):
+    """Yields (row_index, key, row) for every data row; key is None for rows without a link."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        column = _link_column(header)
+        rows = reader
+        if column is None:
+            # No header line: the first row is a job too
+            column = LINK_COLUMN
+            rows = _prepend(header, reader)
+        for index, row in enumerate(rows):
+            link = _row_link(row, column)
+            yield index, (_sort_key(job_key(link)) if link else None), row
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+def _sort_key(key):
+    # int job IDs and normalized URLs in one sortable, tab-free string space
+    return f"i:{key:020d}" if isinstance(key, int) else "s:" + key.replace("\t", " ").replace("\n", " ")
+
+# ===============================
+# 🔹 PASS 1: PICK ONE ROW PER JOB
+# ===============================
+
+class WinnerIndex:
+    """key -> best (-rank, file, row) seen so far; spills sorted runs to disk when it grows too big."""
+
+    def __init__(self, max_keys=MAX_KEYS_IN_MEMORY):
+        self.max_keys = max_keys
+        self.best = {}
+        self.runs = []
+        self.tmp_dir = None
+
+    def offer(self, key, rank, file_index, row_index):
+        candidate = (-rank, file_index, row_index)
+        current = self.best.get(key)
+        if current is None or candidate < current:
+            self.best[key] = candidate
+            if current is None and len(self.best) >= self.max_keys:
+                self._spill()
+
+    def _spill(self):
+        if self.tmp_dir is None:
+            self.tmp_dir = tempfile.mkdtemp(prefix="dedupe_")
+        path = os.path.join(self.tmp_dir, f"run_{len(self.runs)}.tsv")
+        with open(path, 'w', encoding='utf-8') as f:
+            for key in sorted(self.best):
+                neg_rank, file_index, row_index = self.best[key]
+                f.write(f"{key}\t{neg_rank}\t{file_index}\t{row_index}\n")
+        self.runs.append(path)
+        self.best.clear()
+
+    @staticmethod
+    def _read_run(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, neg_rank, file_index, row_index = line.rstrip("\n").split("\t")
+                yield key, int(neg_rank), int(file_index), int(row_index)
+
+    def winners(self):
+        """Yields (file_index, row_index) of the row to keep for every job."""
+        if not self.runs:
+            for _, file_index, row_index in self.best.values():
+                yield file_index, row_index
+            return
+
+        # External merge: runs are sorted by key, the first entry per key is the best
+        self._spill()
+        last_key = None
+        for key, _, file_index, row_index in heapq.merge(*(self._read_run(path) for path in self.runs)):
+            if key != last_key:
+                last_key = key
+                yield file_index, row_index
+
+    def cleanup(self):
+        for path in self.runs:
+            os.remove(path)
+        if self.tmp_dir:
+            os.rmdir(self.tmp_dir)
+
+# ===============================
+# 🔹 PASS 2: REWRITE
+# ===============================
+
+def rewrite(path, keep):
+    """Rewrites the file with only the rows whose flag is set (atomic replace)."""
+    tmp_path = path + ".tmp"
+    with open(path, 'r', newline='', encoding='utf-8') as src, \
+            open(tmp_path, 'w', newline='', encoding='utf-8') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, None)
+        if header is not None and _link_column(header) is not None:
+            writer.writerow(header)
+            rows = reader
+        else:
+            rows = _prepend(header, reader) if header is not None else reader
+        for index, row in enumerate(rows):
+            if keep[index]:
+                writer.writerow(row)
+    os.replace(tmp_path, path)
+
+def dedupe(paths, dry_run=False, max_keys=MAX_KEYS_IN_MEMORY):
+    """Dedupes the files within and across each other. Returns per-file stats."""
+    index = WinnerIndex(max_keys)
+    keep = []        # per file: 1 byte per row, 1 = keep
+    stats = []
+    try:
+        for file_index, path in enumerate(paths):
+            rank = FILE_RANK.get(os.path.basename(path), OTHER_FILE_RANK)
+            flags = bytearray()
+            for row_index, key, _ in iter_keyed_rows(path):
+                if key is None:
+                    flags.append(1)    # not a job row: leave it alone
+                    continue
+                flags.append(0)
+                index.offer(key, rank, file_index, row_index)
+            keep.append(flags)
+            stats.append({"file": path, "rows": len(flags)})
+
+        for file_index, row_index in index.winners():
+            keep[file_index][row_index] = 1
+    finally:
+        index.cleanup()
+
+    for file_index, path in enumerate(paths):
+        kept = sum(keep[file_index])
+        stats[file_index]["kept"] = kept
+        stats[file_index]["removed"] = stats[file_index]["rows"] - kept
+        if stats[file_index]["removed"] and not dry_run:
+            rewrite(path, keep[file_index])
+    return stats
+
+# ===============================
+# 🔹 COMMAND LINE
+# ===============================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Remove duplicate jobs (by Naukri job ID) within and across the history CSVs")
+    parser.add_argument("files", nargs="*",
+                        help="CSV files to dedupe together (default: every history file in this folder)")
+    parser.add_argument("--dry-run", action="store_true", help="only report, do not rewrite anything")
+    parser.add_argument("--max-keys", type=int, default=MAX_KEYS_IN_MEMORY,
+                        help=f"jobs held in memory before spilling to disk (default: {MAX_KEYS_IN_MEMORY})")
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join(FOLDER, name) for name in STATUS_FILES.values()]
+    files = [path for path in files if os.path.exists(path)]
+    if not files:
+        print("No CSV files found.")
+        sys.exit(0)
+
+    stats = dedupe(files, dry_run=args.dry_run, max_keys=args.max_keys)
+
+    # ===== SUMMARY =====
+    print("===== SUMMARY =====")
+    for entry in stats:
+        print(f"{os.path.basename(entry['file']):25}: {entry['rows']:7} rows, {entry['removed']:6} duplicates removed")
+    total_removed = sum(entry["removed"] for entry in stats)
+    if total_removed == 0:
+        print("\nNo duplicates found ✅")
+    elif args.dry_run:
+        print(f"\n{total_removed} duplicates found (dry run, nothing changed)")
+    else:
+        print(f"\n✅ {total_removed} duplicates removed, files updated.")
@@ -1,96 +1,154 @@
 import os
-import csv
 import time
-import shutil
+import csv
 import logging
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.firefox.service import Service
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-# ================================
-# 🔹 Function to get Firefox binary
-# ================================
-def get_firefox_binary():
-    firefox_path = shutil.which("firefox")
-    if firefox_path:
-        return firefox_path
-    else:
-        possible_paths = [
-            "C:\\Program Files\\Mozilla Firefox\\firefox.exe",
-            "C:\\Program Files (x86)\\Mozilla Firefox\\firefox.exe"
-        ]
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        raise Exception("Firefox binary not found! Please check your installation.")
-
-# ================================
-# 🔹 Auto detect paths
-# ================================
-FIREFOX_BINARY_PATH = get_firefox_binary()
-GECKODRIVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geckodriver.exe")
-
-# ================================
-# 🔹 Logging setup
-# ================================
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-# ================================
-# 🔹 Firefox options
-# ================================
-options = Options()
-options.binary_location = FIREFOX_BINARY_PATH
-options.add_argument("--headless")
-
-service = Service(GECKODRIVER_PATH)
-driver = webdriver.Firefox(service=service, options=options)
-wait = WebDriverWait(driver, 10)
+import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future
+from firefox_setup import build_driver, build_driver_in_background, discard_driver
+from search_results import iter_browser_pages, search_key, fresh_first_url, sorted_by_date
+from job_ledger import open_ledger, STATUS_FILES
+from job_ids import JobKeyIndex, job_key
+from company_index import CompanyIndex
+from csv_sink import CsvSink, DURABILITY_CHOICES, exit_on_sigterm
+from run_metrics import RunMetrics
+from rate_scheduler import RateScheduler
+from adaptive_wait import AdaptiveWaits
+import command_profiler
 
 # ================================
-# 🔹 User Input
+# 🔹 Command line
 # ================================
-url = input("Enter the job listing URL: ").strip()
-target_jobs = int(input("Enter number of jobs you want to scrape: "))
-
-if not url:
-    logging.error("No URL provided. Exiting...")
-    driver.quit()
-    exit()
-
-driver.get(url)
+parser = argparse.ArgumentParser(description="Scrape Naukri search results into Delete_me/jobs.csv")
+parser.add_argument("--engine", choices=["browser", "http"], default="browser",
+                    help="browser = headless Firefox (default), http = plain HTTP fetch + HTML parse")
+parser.add_argument("--url", help="job listing URL (prompted for when omitted)")
+parser.add_argument("--target", type=int, help="number of jobs to scrape (prompted for when omitted; per search in batch mode)")
+parser.add_argument("--batch",
+                    help='file with one search per line, "URL,target" (target defaults to --target); '
+                         "the searches share one skip index and write one jobs.csv")
+parser.add_argument("--parallel", type=int, default=2,
+                    help="batch mode: searches scraped at the same time, each with its own browser (default: 2)")
+parser.add_argument("--concurrency", type=int, default=4,
+                    help="result pages fetched in parallel by the http engine (default: 4)")
+parser.add_argument("--prefetch", type=int, default=0,
+                    help="result pages the browser engine loads ahead in background tabs (default: 0 = off)")
+parser.add_argument("--lean", action="store_true",
+                    help="browser engine: skip images, fonts, media and tracker/ad hosts")
+parser.add_argument("--durability", choices=DURABILITY_CHOICES, default="flush",
+                    help="how hard jobs.csv batches are pushed to disk (default: flush)")
+parser.add_argument("--rate", type=float, default=30,
+                    help="result pages per minute to start at; adapts to how the site responds (default: 30)")
+parser.add_argument("--max-rate", type=float, default=120,
+                    help="result pages per minute never to exceed (default: 120)")
+parser.add_argument("--stop-after", type=int, default=20,
+                    help="stop a date-sorted search (--fresh-first) after this many already-known jobs in a row, "
+                         "i.e. once caught up with its last run (default: 20, 0 = never)")
+parser.add_argument("--fresh-first", action="store_true",
+                    help="sort the search by date so new postings come first and the run stops early")
+parser.add_argument("--profile-commands", action="store_true",
+                    help="time every WebDriver command and report the slowest ones per page at the end")
+parser.add_argument("--metrics-every", type=int, default=60,
+                    help="seconds between page throughput / timing reports (default: 60)")
+
+# Prefs the browser engine needs; a warm driver handed in by the daemon is built with them
+BROWSER_PREFS = {
+    # let window.open() from our script load result pages in background tabs
+    "dom.disable_open_during_load": False,
+    "browser.link.open_newwindow": 3,
+}
 
 # ================================
 # 🔹 Folder Setup
 # ================================
 folder_name = "Delete_me"
-os.makedirs(folder_name, exist_ok=True)
 
 csv_filename = os.path.join(folder_name, "jobs.csv")
 filter_csv_filename = os.path.join(folder_name, "jobs_filter.csv")
+batch_report_filename = os.path.join(folder_name, "batch_report.csv")
 
 # ================================
-# 🔹 Skip Files Configuration
+# 🔹 Run State (set up by main() for every run)
 # ================================
-skip_files = {
-    "already_applied.csv": "./Already_applied_folder/already_applied.csv",
-    "skip_jobs.csv (4th col)": "./Already_applied_folder/skip_jobs.csv",
-    "company_sites.csv": "./Already_applied_folder/company_sites.csv",
-    "do_manually_apply.csv": "./Already_applied_folder/do_manually_apply.csv",
-    "expired_jobs.csv": "./Already_applied_folder/expired_jobs.csv",
-    "success_applied.csv": "./Already_applied_folder/success_applied.csv",
-    "jobs.csv": csv_filename
-}
+args = None
+ledger = None
+sink = None
+metrics = None
+scheduler = None
+searches = []
+
+# Canonical job IDs of everything in jobs.csv plus what this run extracted,
+# shared by all searches of a batch so a job listed by several is written once
+existing_links = JobKeyIndex()
+found_this_run = set()
+index_lock = threading.Lock()
+# Employers that only take applications on their own site (company_list.csv)
+blocked_companies = CompanyIndex()
 
-existing_links = set()
-skip_source_map = {}
+ScrapCounter = 0
+TotalSkipped = 0
+skip_counts = {}
+
+# ================================
+# 🔹 One Search (incremental: stops once caught up with its last run)
+# ================================
+# Newest job keys kept per search, so the next run knows where it caught up
+WATERMARK_SIZE = 200
+
+class SearchRun:
+    """Progress of one search URL; a batch runs several side by side."""
+
+    def __init__(self, url, target):
+        self.url = url
+        self.target = target
+        self.key = search_key(url)
+        # Known jobs at the top only mean "caught up" when the newest postings come first
+        self.stop_after = args.stop_after if sorted_by_date(url) else 0
+        # newest job keys at the end of the last run of this search, newest first
+        self.watermark, self.last_run_at = ledger.search_watermark(self.key)
+        self.watermark_keys = set(self.watermark)
+        self.newest_keys = []   # top of the results in this run, in page order
+        self.known_streak = 0   # already-known jobs in a row
+        self.caught_up = False
+        self.pages = 0
+        self.tuples = 0
+        self.extracted = 0
+        self.skipped = 0
+        self.stopped = "no more pages"
+
+    def done(self):
+        return self.extracted >= self.target or self.caught_up
+
+    def save_watermark(self):
+        if self.newest_keys:
+            # An early stop only saw the top of the results: keep the older keys behind the new ones
+            seen = set(self.newest_keys)
+            keys = self.newest_keys + [key for key in self.watermark if key not in seen]
+            ledger.save_search_watermark(self.key, self.url, keys[:WATERMARK_SIZE], self.extracted)
+
+def read_batch_file(path, default_target):
+    """[(url, target)] from lines of "URL" or "URL,target"; blank lines and # comments are ignored."""
+    queries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            link, _, target = line.rpartition(",")
+            if not link or not target.strip().isdigit():
+                link, target = line, None
+            target = int(target) if target else default_target
+            if target is None:
+                raise SystemExit(f"{path} line {number}: no target (add ,<jobs> or pass --target)")
+            queries.append((link.strip(), target))
+    return queries
 
 # ================================
 # 🔹 Function to load skip links
 # ================================
-def load_links_from_file(file_path, source_name, column_index=0):
+def load_links_from_file(file_path, column_index=0):
     if os.path.exists(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             reader = csv.reader(f)
@@ -98,111 +156,311 @@ def load_links_from_file(file_path, source_name, column_index=0):
                 if len(row) > column_index:
                     link = row[column_index].strip()
                     if link:
-                        existing_links.add(link)
-                        skip_source_map[link] = source_name
+                        existing_links.add_url(link)
 
-for source, path in skip_files.items():
-    if "skip_jobs.csv" in source:
-        load_links_from_file(path, source, column_index=3)
-    else:
-        load_links_from_file(path, source, column_index=0)
-
-# ================================
-# 🔹 Counters and Data Holders
-# ================================
-filter_data = []
-ScrapCounter = 0
-TotalSkipped = 0
-skip_counts = {src: 0 for src in skip_files.keys()}
+def skip_reason(job_link):
+    if existing_links.has_url(job_link):
+        return "jobs.csv"
+    status = ledger.status(job_link)
+    return STATUS_FILES[status] if status else None
 
 # ================================
 # 🔹 Safe Save Function
 # ================================
-def safe_save():
-    if filter_data:
-        headers = ["Company Name", "Experience Required", "Location", "Link"]
-
+def safe_save(rows):
+    if rows:
         for file_path in [csv_filename, filter_csv_filename]:
-            file_exists = os.path.exists(file_path)
-            with open(file_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if not file_exists:
-                    writer.writerow(headers)
-                writer.writerows(filter_data)
-
-        filter_data.clear()
+            sink.put_many(file_path, rows)
 
 # ================================
-# 🔹 Scraping Loop (Count-Based)
+# 🔹 Page Processing (shared by both engines)
 # ================================
-try:
-    while ScrapCounter < target_jobs:
-        wait.until(EC.presence_of_all_elements_located((By.CLASS_NAME, "srp-jobtuple-wrapper")))
-        job_elements = driver.find_elements(By.CSS_SELECTOR, "div.srp-jobtuple-wrapper a.title")
+def process_records(search, job_records):
+    global ScrapCounter, TotalSkipped
 
-        for job_element in job_elements:
-            if ScrapCounter >= target_jobs:
+    filter_data = []
+    with index_lock:
+        for record in job_records:
+            if search.extracted >= search.target:
                 break  # stop once target reached
 
-            try:
-                job_link = job_element.get_attribute("href")
-                job_title = job_element.text
+            job_link = record["link"]
+            job_title = record["title"]
 
-                wrapper = job_element.find_element(By.XPATH, "./ancestor::div[contains(@class, 'srp-jobtuple-wrapper')]")
-                company = wrapper.find_element(By.XPATH, ".//a[contains(@class, 'comp-name')]").text or "Not Available"
-                location = wrapper.find_element(By.XPATH, ".//span[contains(@class, 'locWdth')]").text or "Not Available"
+            if not job_link or record["company"] is None or record["location"] is None:
+                logging.error(f"Error extracting job data: incomplete tuple {job_title or job_link}")
+                continue
 
-                try:
-                    experience = wrapper.find_element(By.XPATH, ".//span[contains(@class, 'expwdth')]").text
-                except:
-                    experience = "Not Available"
+            company = record["company"] or "Not Available"
+            location = record["location"] or "Not Available"
+            experience = record["experience"] if record["experience"] is not None else "Not Available"
 
-                # Skip duplicate links
-                if job_link in existing_links:
-                    reason = skip_source_map.get(job_link, "Unknown Source")
-                    skip_counts[reason] = skip_counts.get(reason, 0) + 1
-                    TotalSkipped += 1
-                    logging.warning(f"⚠️ Skipped ({skip_counts[reason]} from {reason}): {job_link}")
-                    continue
+            key = job_key(job_link)
+            search.tuples += 1
+            if len(search.newest_keys) < WATERMARK_SIZE:
+                search.newest_keys.append(key)
 
-                existing_links.add(job_link)
+            # Skip company-site employers and duplicate links
+            if company in blocked_companies:
+                reason = "company_list.csv"
+            elif key in found_this_run:
+                # Listed by another search of the batch: says nothing about this search's last run
+                reason = "this run"
+            else:
+                reason = skip_reason(job_link)
+                # A run of known jobs means everything below was seen by an earlier run
+                search.known_streak = search.known_streak + 1 if reason or key in search.watermark_keys else 0
+            if reason:
+                skip_counts[reason] = skip_counts.get(reason, 0) + 1
+                TotalSkipped += 1
+                search.skipped += 1
+                logging.warning(f"⚠️ Skipped ({skip_counts[reason]} from {reason}): {job_link}")
+            else:
+                existing_links.add(key)
+                found_this_run.add(key)
 
                 filter_data.append([company, experience, location, job_link])
                 ScrapCounter += 1
+                search.extracted += 1
                 logging.info(f"✅ Extracted {ScrapCounter}: {job_title}")
 
-                safe_save()
+            if search.stop_after and search.known_streak >= search.stop_after:
+                search.caught_up = True
+                break
 
-            except Exception as e:
-                logging.error(f"Error extracting job data: {e}")
+    safe_save(filter_data)
 
-        # Stop if enough jobs found
-        if ScrapCounter >= target_jobs:
-            break
+# ================================
+# 🔹 Page Loop (Count-Based, shared by both engines)
+# ================================
+def consume_pages(search, pages):
+    try:
+        waited = time.perf_counter()
+        for page_link, job_records, timer in pages:
+            # Time spent blocked on the engine (less than load + extract when pages are fetched ahead)
+            timer.add("wait", (time.perf_counter() - waited) * 1000)
+            if not job_records:
+                metrics.record(page_link, "empty", timer)
+                command_profiler.item_done(page_link)
+                logging.info(f"🚫 No job tuples on {page_link}. Exiting pagination.")
+                break
+            search.pages += 1
+            before = search.extracted
+            with timer.phase("filter"):
+                process_records(search, job_records)
+            metrics.record(page_link, "page", timer, tuples=len(job_records), extracted=search.extracted - before)
+            command_profiler.item_done(page_link)
+            waited = time.perf_counter()
+
+            # Stop if enough jobs found (closing `pages` stops any prefetched pages)
+            if search.extracted >= search.target:
+                search.stopped = "target reached"
+                break
+            if search.caught_up:
+                search.stopped = "caught up"
+                logging.info(f"🛑 {search.known_streak} known jobs in a row, caught up with earlier runs. Stopping.")
+                break
+        else:
+            logging.info("🚫 No next page available.")
+    finally:
+        pages.close()
+
+def run_searches(scrape_one):
+    """Runs scrape_one(search) for every search, at most --parallel at a time."""
+    def run(search):
+        try:
+            scrape_one(search)
+        except Exception as e:
+            # One broken search does not stop the rest of the batch
+            search.stopped = f"error: {e}"
+            logging.error(f"❌ Search failed: {search.url}: {e}")
+
+    workers = max(1, min(args.parallel, len(searches)))
+    if workers == 1:
+        for search in searches:
+            run(search)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search") as pool:
+            list(pool.map(run, searches))
 
-        # Try next page
+# ================================
+# 🔹 Browser Engine
+# ================================
+def browser_options():
+    return {"headless": True, "lean": args.lean, "prefs": BROWSER_PREFS if args.prefetch > 0 else {}}
+
+def scrape_with_browser(driver=None):
+    """`driver` is a warm driver handed in, or the Future of one main() started in the background;
+    it serves the first search. Parallel searches get a browser each."""
+    idle_drivers = queue.Queue()
+    own_drivers = []
+    if driver is not None:
+        idle_drivers.put(driver)
+    waits = AdaptiveWaits()
+
+    def scrape_one(search):
         try:
-            next_button = wait.until(EC.presence_of_element_located(
-                (By.XPATH, "//a[contains(@class, 'styles_btn-secondary__2AsIP') and span[contains(text(), 'Next')]]")
-            ))
-            next_href = next_button.get_attribute("href")
-            if next_href:
-                driver.get(next_href)
-                time.sleep(2)
-            else:
-                logging.info("🚫 No next page available.")
-                break
-        except:
-            logging.info("🚫 Next button not found. Exiting pagination.")
-            break
-
-finally:
-    driver.quit()
-    safe_save()
-
-    logging.info("📊 Final Summary →")
-    logging.info(f"Extracted Jobs: {ScrapCounter}")
-    logging.info(f"Skipped Jobs: {TotalSkipped}")
-    for source, count in skip_counts.items():
-        logging.info(f"  {source}: {count}")
-    logging.info("✅ Completed Successfully.")
+            search_driver = idle_drivers.get_nowait()
+        except queue.Empty:
+            search_driver = build_driver(**browser_options())
+            own_drivers.append(search_driver)
+        if isinstance(search_driver, Future):
+            search_driver = search_driver.result()
+            own_drivers.append(search_driver)
+        try:
+            consume_pages(search, iter_browser_pages(search_driver, waits, search.url,
+                                                     prefetch=args.prefetch, scheduler=scheduler))
+        finally:
+            idle_drivers.put(search_driver)
+
+    try:
+        run_searches(scrape_one)
+    finally:
+        for own_driver in own_drivers:
+            own_driver.quit()
+        while not idle_drivers.empty():
+            leftover = idle_drivers.get_nowait()
+            if isinstance(leftover, Future):
+                discard_driver(leftover)
+
+# ================================
+# 🔹 HTTP Engine (no browser)
+# ================================
+def scrape_with_http():
+    from http_scraper import make_session, iter_result_pages
+
+    concurrency = max(1, args.concurrency)
+    with make_session(pool_size=concurrency * max(1, args.parallel)) as session:
+        run_searches(lambda search: consume_pages(
+            search, iter_result_pages(session, search.url, concurrency=concurrency, scheduler=scheduler)))
+
+# ================================
+# 🔹 Per-Search Yield Report
+# ================================
+def write_batch_report():
+    with open(batch_report_filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Search URL", "Target", "Pages", "Jobs Seen", "Extracted", "Skipped", "Stopped"])
+        for search in searches:
+            writer.writerow([search.url, search.target, search.pages, search.tuples,
+                             search.extracted, search.skipped, search.stopped])
+
+    logging.info("📋 Yield per search →")
+    for search in searches:
+        yield_pct = 100 * search.extracted / search.tuples if search.tuples else 0
+        logging.info(f"  {search.extracted:4}/{search.target:<4} new from {search.tuples:4} seen "
+                     f"({yield_pct:3.0f}%), {search.pages} pages, {search.stopped}: {search.url}")
+    logging.info(f"  Report saved to {batch_report_filename}")
+
+# ================================
+# 🔹 Scraping Run
+# ================================
+def main(argv=None, driver=None):
+    """Runs one scrape. `driver` lets the browser daemon lend a warm headless Firefox."""
+    global args, ledger, sink, metrics, scheduler, searches, existing_links, found_this_run, blocked_companies, ScrapCounter, TotalSkipped, skip_counts
+
+    run_started = time.monotonic()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parser.parse_args(argv)
+
+    # ================================
+    # 🔹 User Input
+    # ================================
+    if args.batch:
+        queries = read_batch_file(args.batch, args.target)
+    else:
+        url = (args.url if args.url is not None else input("Enter the job listing URL: ")).strip()
+        target_jobs = args.target if args.target is not None else int(input("Enter number of jobs you want to scrape: "))
+        queries = [(url, target_jobs)] if url else []
+
+    if not queries:
+        logging.error("No URL provided. Exiting...")
+        return
+    if args.fresh_first:
+        queries = [(fresh_first_url(url), target) for url, target in queries]
+
+    os.makedirs(folder_name, exist_ok=True)
+
+    if args.profile_commands and args.engine == "browser":
+        command_profiler.start("scrape")
+
+    # Firefox boots in the background while the skip indexes load
+    if args.engine == "browser" and driver is None:
+        driver = build_driver_in_background(**browser_options())
+
+    # ================================
+    # 🔹 Skip Index (job ledger + current jobs.csv)
+    # ================================
+    try:
+        ledger = open_ledger()
+        existing_links = JobKeyIndex()
+        found_this_run = set()
+        blocked_companies = CompanyIndex(ledger.company_keys())
+
+        # History lives in the ledger; only the pending scrape file is read here
+        load_links_from_file(csv_filename, column_index=3)
+
+        # Where the last run of each search stopped
+        searches = []
+        for url, target in queries:
+            search = SearchRun(url, target)
+            if any(search.key == other.key for other in searches):
+                logging.warning(f"⚠️ Same search listed twice, using the first: {url}")
+                continue
+            if args.stop_after and not search.stop_after:
+                logging.info(f"Search is sorted by relevance, so it is scraped to its target without stopping "
+                             f"early (add --fresh-first to stop once caught up): {url}")
+            if search.last_run_at:
+                logging.info(f"🔖 Search last scraped {search.last_run_at}, "
+                             f"{len(search.watermark)} newest jobs remembered: {url}")
+            searches.append(search)
+    except BaseException:
+        if isinstance(driver, Future):
+            discard_driver(driver)
+        command_profiler.stop("pages")
+        raise
+    logging.info(f"📚 Skip index ready in {time.monotonic() - run_started:.1f}s "
+                 f"({len(existing_links)} jobs in jobs.csv, {len(blocked_companies)} company-site employers)")
+
+    # ================================
+    # 🔹 Counters
+    # ================================
+    ScrapCounter = 0
+    TotalSkipped = 0
+    skip_counts = {src: 0 for src in list(STATUS_FILES.values()) + ["company_list.csv", "jobs.csv", "this run"]}
+
+    exit_on_sigterm()
+    sink = CsvSink(durability=args.durability)
+    for file_path in [csv_filename, filter_csv_filename]:
+        sink.register(file_path, ["Company Name", "Experience Required", "Location", "Link"])
+    metrics = RunMetrics("scrape", unit="pages", report_every=args.metrics_every, started=run_started)
+    scheduler = RateScheduler(rate=args.rate / 60, max_rate=args.max_rate / 60, name="result page")
+
+    try:
+        if args.engine == "http":
+            scrape_with_http()
+        else:
+            scrape_with_browser(driver)
+    finally:
+        sink.close()
+        for search in searches:
+            search.save_watermark()
+        ledger.close()
+        metrics.summary()
+        command_profiler.stop("pages")
+        if args.batch:
+            write_batch_report()
+
+        logging.info("📊 Final Summary →")
+        logging.info(f"Extracted Jobs: {ScrapCounter}")
+        logging.info(f"Skipped Jobs: {TotalSkipped}")
+        caught_up = sum(search.caught_up for search in searches)
+        if caught_up:
+            logging.info(f"Stopped early: {caught_up} of {len(searches)} search(es) caught up with earlier runs")
+        logging.info(f"Pace at the end: {scheduler.describe()}")
+        for source, count in skip_counts.items():
+            logging.info(f"  {source}: {count}")
+        logging.info("✅ Completed Successfully.")
+
+if __name__ == "__main__":
+    main()
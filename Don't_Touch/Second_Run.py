@@ -1,67 +1,48 @@
 import json
 import time
-import csv
+import asyncio
 import logging
 import os
 import threading
 import queue
-import shutil
-import configparser
-from selenium.webdriver.firefox.service import Service
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
+import heapq
+import itertools
+import argparse
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime
-
-# ===============================
-# 🔹 FIREFOX SETUP FUNCTIONS
-# ===============================
-
-def get_firefox_profile():
-    profile_ini_path = os.path.expanduser("~/.mozilla/firefox/profiles.ini")
-    if os.name == "nt":
-        profile_ini_path = os.path.join(os.getenv("APPDATA"), "Mozilla", "Firefox", "profiles.ini")
-
-    config = configparser.ConfigParser()
-    if os.path.exists(profile_ini_path):
-        config.read(profile_ini_path)
-        for section in config.sections():
-            if config.has_option(section, "Default") and config.get(section, "Default") == "1":
-                profile_path = config.get(section, "Path")
-                return os.path.join(os.path.dirname(profile_ini_path), profile_path)
-    raise Exception("No default Firefox profile found!")
-
-def get_firefox_binary():
-    firefox_path = shutil.which("firefox")
-    if firefox_path:
-        return firefox_path
-    else:
-        possible_paths = [
-            "C:\\Program Files\\Mozilla Firefox\\firefox.exe",
-            "C:\\Program Files (x86)\\Mozilla Firefox\\firefox.exe"
-        ]
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        raise Exception("Firefox binary not found! Please check your installation.")
+from firefox_setup import get_firefox_profile, build_driver, clone_firefox_profile, remove_profile_clone, LEAN_PREFS
+from job_ledger import open_ledger
+from session_check import restore_cookies
+from job_ids import job_key
+from company_index import CompanyIndex, company_key
+from csv_sink import CsvSink, DURABILITY_CHOICES, exit_on_sigterm
+from run_metrics import RunMetrics, PhaseTimer
+from run_checkpoint import RunCheckpoint, iter_csv_rows, read_csv_row
+from adaptive_wait import AdaptiveWaits, MAX_TIMEOUT
+from driver_health import DriverSupervisor, BrowserUnavailable
+import command_profiler
+from rate_scheduler import RateScheduler, ThrottledError, paced_get, page_throttle_reason, tab_throttle_reason
+from bidi_tabs import BiDiSession, BiDiTab, BiDiError
+from page_classifier import (
+    EXPIRED, ALREADY_APPLIED, COMPANY_SITE, APPLYABLE, UNKNOWN,
+    prepare_driver, classify_job_page, classify_tab,
+)
 
 # ===============================
 # 🔹 INITIAL SETUP
 # ===============================
 
-FIREFOX_BINARY = get_firefox_binary()
-PROFILE_PATH = get_firefox_profile()
+# Resolved in main(); stays None with --no-profile
+PROFILE_PATH = None
 
 current_time = datetime.now().strftime("%Y-%m-%d_%H")
 already_applied_folder = "./Already_applied_folder"
 os.makedirs(already_applied_folder, exist_ok=True)
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
-DRIVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geckodriver.exe")
 CSV_FILE = "./Delete_me/jobs.csv"
 
 COMPANY_SITES_CSV = os.path.join(already_applied_folder, "company_sites.csv")
@@ -71,7 +52,7 @@ ALREADY_APPLIED_CSV = os.path.join(already_applied_folder, "already_applied.csv"
 EXPIRED_JOBS_CSV = os.path.join(already_applied_folder, "expired_jobs.csv")
 COMPANY_LIST_CSV = os.path.join(already_applied_folder, "company_list.csv")
 
-# Counters
+# Counters (shared by all workers, guarded by state_lock)
 success_apply = 0
 error_apply = 0
 already_applied = 0
@@ -79,215 +60,803 @@ company_sites_count = 0
 expired_jobs_count = 0
 line_no = 0
 
+state_lock = threading.Lock()
+
+# row = byte offset of the job's line in jobs.csv (used by the run checkpoint)
+# attempt = how many times the job already timed out in this run
+Job = namedtuple("Job", ["company_name", "experience", "location", "job_url", "row", "attempt"], defaults=(None, 0))
+
+# A job that times out is retried later in the run with a longer wait budget;
+# only after MAX_ATTEMPTS timeouts does it go to do_manually_apply.csv
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 30        # seconds before a deferred job is tried again
+RETRY_POLL = 0.5
+
 # ===============================
 # 🔹 FIREFOX DRIVER SETUP
 # ===============================
 
-service = Service(DRIVER_PATH)
-options = Options()
-options.binary_location = FIREFOX_BINARY
-options.add_argument("-profile")
-options.add_argument(PROFILE_PATH)
-driver = webdriver.Firefox(service=service, options=options)
-wait = WebDriverWait(driver, 10)
+# Extra build_driver() options from the command line (headless, lean on a fresh profile, BiDi for --tabs)
+driver_options = {}
+# Prefs baked into the workers' profile copies (lean mode)
+clone_prefs = None
+# DriverSupervisor limits from the command line (recycle every N jobs / above N MB / when N times slower)
+health_options = {}
+# A job whose browser died under it is run again this many times on a new browser
+JOB_RESTARTS = 1
+# time.monotonic() when main() started, for the startup timings
+run_started = 0.0
+# Workers whose browser could still start; the last one to fail empties the queue
+workers_running = 0
+
+def start_driver(profile_path):
+    driver = build_driver(profile_path=profile_path, **driver_options)
+    prepare_driver(driver, CLASSIFY_SCRIPT_TIMEOUT)
+    return driver
+
+def worker_profile(clone_as=None):
+    """The profile a worker's browsers run on. Returns (path, profile copy or None).
+
+    clone_as names the worker's own copy of the profile; None runs on
+    PROFILE_PATH itself (or on a throwaway profile with --no-profile).
+    """
+    if clone_as:
+        clone = clone_firefox_profile(PROFILE_PATH, clone_as, clone_prefs)
+        return clone, clone
+    return PROFILE_PATH, None
+
+def start_worker_driver(profile_path, clone=None):
+    """Starts one worker's Firefox. Runs in the worker thread, so it overlaps with main() loading the ledger."""
+    driver = start_driver(profile_path)
+    if clone and restore_cookies(driver):
+        # Profile copies can lag behind the last login; bring in its saved cookies
+        logging.info("🍪 Restored the saved Naukri session")
+    logging.info(f"🚀 Firefox ready {time.monotonic() - run_started:.1f}s after start")
+    return driver
+
+def worker_stopped(dispatcher, reason):
+    """A worker cannot go on. Once no worker is left, the queue is emptied so main() can finish
+    and close the writers; those jobs stay unfinished in the checkpoint for the next run."""
+    global workers_running
+
+    logging.error(f"❌ Worker stopped: {reason}")
+    with state_lock:
+        workers_running -= 1
+        last = workers_running == 0
+    if last:
+        while dispatcher.acquire() is not None:
+            pass
 
 # ===============================
-# 🔹 THREADING + CSV WRITERS (UPDATED)
+# 🔹 CSV WRITER (one batched writer for every result file)
 # ===============================
 
-company_sites_queue = queue.Queue()
-failed_jobs_queue = queue.Queue()
-success_applied_queue = queue.Queue()
-already_applied_queue = queue.Queue()
-expired_jobs_queue = queue.Queue()
-
-company_sites_lock = threading.Lock()
-failed_jobs_lock = threading.Lock()
-success_applied_lock = threading.Lock()
-already_applied_lock = threading.Lock()
-expired_jobs_lock = threading.Lock()
-
-def write_to_csv(file_path, queue, lock, headers):
-    """Writes complete job data (company_name, experience, location, link)"""
-    with lock:
-        if not os.path.exists(file_path) or os.stat(file_path).st_size == 0:
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(headers)
-
-    existing_links = set()
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            next(reader, None)
-            for row in reader:
-                if len(row) > 3:
-                    existing_links.add(row[3])  # last column = link
-
-    while True:
-        data = queue.get()
-        if data is None:
-            break
-        company_name, experience, location, job_url = data
-
-        if job_url in existing_links:
-            queue.task_done()
-            continue
-
-        with lock:
-            with open(file_path, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([company_name, experience, location, job_url])
-            existing_links.add(job_url)
-        queue.task_done()
-
 headers = ["Company Name", "Experience", "Location", "Link"]
-
-company_thread = threading.Thread(target=write_to_csv, args=(COMPANY_SITES_CSV, company_sites_queue, company_sites_lock, headers))
-failed_thread = threading.Thread(target=write_to_csv, args=(FAILED_JOBS_CSV, failed_jobs_queue, failed_jobs_lock, headers))
-success_thread = threading.Thread(target=write_to_csv, args=(SUCCESS_APPLIED_CSV, success_applied_queue, success_applied_lock, headers))
-already_applied_thread = threading.Thread(target=write_to_csv, args=(ALREADY_APPLIED_CSV, already_applied_queue, already_applied_lock, headers))
-expired_jobs_thread = threading.Thread(target=write_to_csv, args=(EXPIRED_JOBS_CSV, expired_jobs_queue, expired_jobs_lock, headers))
-
-for t in [company_thread, failed_thread, success_thread, already_applied_thread, expired_jobs_thread]:
-    t.start()
+RESULT_CSVS = [COMPANY_SITES_CSV, FAILED_JOBS_CSV, SUCCESS_APPLIED_CSV, ALREADY_APPLIED_CSV, EXPIRED_JOBS_CSV]
+
+# Created in main()
+sink = None
+metrics = None
+# Paces every job page load across all workers (one account, one budget)
+scheduler = None
+# Wait timeouts learned from how long pages actually take
+waits = AdaptiveWaits()
+# The in-page classifier must be allowed its longest possible (retry) wait
+CLASSIFY_SCRIPT_TIMEOUT = MAX_TIMEOUT * MAX_ATTEMPTS
 
 # ===============================
-# 🔹 HELPER FUNCTIONS
+# 🔹 LOAD EXISTING DATA
 # ===============================
 
-def load_urls_from_csv(file_path, column_index=3):
-    if not os.path.exists(file_path):
-        return set()
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        next(reader, None)
-        urls = set()
-        for row in reader:
-            if len(row) > column_index:
-                urls.add(row[column_index])
-        return urls
-
-def load_company_names(file_path):
-    if not os.path.exists(file_path):
-        return set()
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        next(reader, None)
-        return {row[0].strip() for row in reader if row}
-
-def append_company_name(file_path, company_name):
-    if not os.path.exists(file_path) or os.stat(file_path).st_size == 0:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Company Name"])
-    with open(file_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow([company_name])
+# Opened in main(): the job ledger (history of every job outcome) and the
+# normalized keys of the company-site employers, few enough to keep in memory
+ledger = None
+company_list = CompanyIndex()
+checkpoint = None
+
+# Canonical IDs of the jobs currently open in some worker
+in_flight_keys = set()
+
+def record_outcome(job, status, file_path):
+    """Stores the outcome in the ledger and queues the CSV row if it is new."""
+    if ledger.record(job.job_url, status, job.company_name, job.experience, job.location):
+        sink.put(file_path, [job.company_name, job.experience, job.location, job.job_url])
 
 # ===============================
-# 🔹 LOAD EXISTING DATA
+# 🔹 WORK QUEUE
 # ===============================
 
-already_applied_urls = load_urls_from_csv(ALREADY_APPLIED_CSV)
-company_sites_urls = load_urls_from_csv(COMPANY_SITES_CSV)
-expired_jobs_urls = load_urls_from_csv(EXPIRED_JOBS_CSV)
-manual_jobs_urls = load_urls_from_csv(FAILED_JOBS_CSV)
-company_list = load_company_names(COMPANY_LIST_CSV)
+class CompanyDispatcher:
+    """Hands out jobs so that a company is only ever open in one worker at a time.
+
+    A job whose company is busy in another worker is parked behind it; that
+    worker picks it up next, after company_list has been updated.
+
+    Deferred jobs wait in a retry lane until RETRY_DELAY has passed; a worker
+    takes them whenever the main queue is idle, and workers only stop once
+    the lane is empty.
+    """
+
+    def __init__(self, maxsize=0):
+        self.jobs = queue.Queue(maxsize=maxsize)
+        self.lock = threading.Lock()
+        self.busy_companies = {}
+        self.retry_lane = []
+        self._order = itertools.count()
+
+    @staticmethod
+    def company_key(job):
+        return company_key(job.company_name) or None
+
+    def put(self, job):
+        self.jobs.put(job)
+
+    def close(self, workers):
+        for _ in range(workers):
+            self.jobs.put(None)
+
+    def defer(self, job):
+        with self.lock:
+            heapq.heappush(self.retry_lane, (time.monotonic() + RETRY_DELAY, next(self._order), job))
+
+    def _ready_retry(self):
+        """A deferred job whose delay has passed, else None (after a short nap if one is due soon)."""
+        with self.lock:
+            if not self.retry_lane:
+                return None
+            ready_at = self.retry_lane[0][0]
+            if ready_at <= time.monotonic():
+                return heapq.heappop(self.retry_lane)[2]
+        time.sleep(min(RETRY_POLL, max(0.0, ready_at - time.monotonic())))
+        return None
+
+    def acquire(self):
+        while True:
+            try:
+                job = self.jobs.get(timeout=RETRY_POLL)
+            except queue.Empty:
+                job = self._ready_retry()
+                if job is None:
+                    continue
+            else:
+                if job is None:
+                    with self.lock:
+                        lane_empty = not self.retry_lane
+                    if lane_empty:
+                        return None
+                    # Not done yet: hand the stop signal back and work the retry lane
+                    self.jobs.put(None)
+                    job = self._ready_retry()
+                    if job is None:
+                        continue
+            key = self.company_key(job)
+            if key is None:
+                return job
+            with self.lock:
+                parked = self.busy_companies.get(key)
+                if parked is not None:
+                    parked.append(job)
+                    continue
+                self.busy_companies[key] = deque()
+                return job
+
+    def release(self, job):
+        key = self.company_key(job)
+        if key is None:
+            return None
+        with self.lock:
+            parked = self.busy_companies[key]
+            if parked:
+                return parked.popleft()
+            del self.busy_companies[key]
+            return None
 
 # ===============================
-# 🔹 MAIN JOB LOOP
+# 🔹 JOB PROCESSING
 # ===============================
 
-with open(CSV_FILE, 'r', encoding='utf-8') as file:
-    reader = csv.DictReader(file)
-    for job in reader:
-        company_name = job["Company Name"].strip()
-        experience = job.get("Experience", "").strip()
-        location = job.get("Location", "").strip()
-        job_url = job["Link"].strip()
+def claim_job(job):
+    """Returns True when the job is reserved for the calling worker."""
+    global line_no, company_sites_count
 
+    with state_lock:
         # ✅ Skip if company already seen before
-        if company_name in company_list:
+        if job.company_name in company_list:
             line_no += 1
             company_sites_count += 1
-            logging.info(f"{line_no} Skipping {company_name} (Already in company_list.csv)")
-            company_sites_queue.put((company_name, experience, location, job_url))
-            company_sites_urls.add(job_url)
-            continue
+            logging.info(f"{line_no} Skipping {job.company_name} (Already in company_list.csv)")
+            record_outcome(job, "company_site", COMPANY_SITES_CSV)
+            return False
 
         # ✅ Skip based on URL presence
-        if job_url in already_applied_urls or job_url in company_sites_urls or job_url in expired_jobs_urls or job_url in manual_jobs_urls:
+        if job_key(job.job_url) in in_flight_keys or job.job_url in ledger:
             line_no += 1
-            logging.info(f"{line_no} Skipping known job: {job_url}")
-            continue
+            logging.info(f"{line_no} Skipping known job: {job.job_url}")
+            return False
 
-        driver.get(job_url)
-        time.sleep(3)
+        in_flight_keys.add(job_key(job.job_url))
+        return True
 
-        try:
-            expired_element = driver.find_element(By.CLASS_NAME, "styles_alert-message-text__QwDRi")
-            if expired_element and "expired" in expired_element.text.lower():
-                expired_jobs_count += 1
-                line_no += 1
-                logging.info(f"{line_no} Job Expired ({expired_jobs_count})")
-                expired_jobs_queue.put((company_name, experience, location, job_url))
-                expired_jobs_urls.add(job_url)
-                continue
-        except NoSuchElementException:
-            pass
+def record_page_state(job, page_state, took):
+    """Books a job whose page showed a final state. Returns the outcome, or None if it is to be applied to."""
+    global line_no, already_applied, company_sites_count, expired_jobs_count
 
-        try:
-            already_applied_element = driver.find_element(By.ID, "already-applied")
-            if already_applied_element:
-                line_no += 1
-                already_applied += 1
-                logging.info(f"{line_no} Already Applied ({already_applied})")
-                already_applied_queue.put((company_name, experience, location, job_url))
-                already_applied_urls.add(job_url)
-                continue
-        except NoSuchElementException:
-            pass
+    if page_state == EXPIRED:
+        with state_lock:
+            expired_jobs_count += 1
+            line_no += 1
+            logging.info(f"{line_no} Job Expired ({expired_jobs_count}) {took}")
+            record_outcome(job, "expired", EXPIRED_JOBS_CSV)
+        return "expired"
 
-        company_site_buttons = driver.find_elements(By.ID, "company-site-button")
-        if company_site_buttons:
-            company_sites_count += 1
+    if page_state == ALREADY_APPLIED:
+        with state_lock:
             line_no += 1
-            logging.info(f"{line_no} Company Site Found ({company_sites_count}) - {company_name}")
-            company_sites_queue.put((company_name, experience, location, job_url))
-            append_company_name(COMPANY_LIST_CSV, company_name)
-            company_list.add(company_name)
-            continue
+            already_applied += 1
+            logging.info(f"{line_no} Already Applied ({already_applied}) {took}")
+            record_outcome(job, "already_applied", ALREADY_APPLIED_CSV)
+        return "already_applied"
 
-        try:
-            apply_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//*[text()='Apply']")))
+    if page_state == COMPANY_SITE:
+        with state_lock:
+            company_sites_count += 1
+            line_no += 1
+            logging.info(f"{line_no} Company Site Found ({company_sites_count}) - {job.company_name} {took}")
+            record_outcome(job, "company_site", COMPANY_SITES_CSV)
+            if company_list.add(job.company_name) and ledger.add_company(job.company_name):
+                sink.put(COMPANY_LIST_CSV, [job.company_name])
+        return "company_site"
+
+    return None
+
+def record_applied(job, took):
+    global line_no, success_apply
+
+    with state_lock:
+        success_apply += 1
+        line_no += 1
+        logging.info(f"{line_no} Successfully Applied ({success_apply}) - {job.company_name} {took}")
+        record_outcome(job, "success", SUCCESS_APPLIED_CSV)
+    return "success"
+
+def record_timeout(job, took):
+    """An apply step timed out: retry later with a longer wait, or give up to manual apply."""
+    global line_no, error_apply
+
+    if job.attempt + 1 < MAX_ATTEMPTS:
+        logging.warning(f"⏳ Timed out on {job.company_name} (attempt {job.attempt + 1}/{MAX_ATTEMPTS}), "
+                        f"retrying later with a longer wait {took}")
+        return "deferred"
+    with state_lock:
+        error_apply += 1
+        line_no += 1
+        logging.error(f"{line_no} Manual Apply Needed ({error_apply}) - {job.company_name} {took}")
+        record_outcome(job, "manual", FAILED_JOBS_CSV)
+    return "manual"
+
+def process_job(driver, job, timer):
+    """Opens the job and acts on it. Returns the outcome recorded for it ("deferred" = retry later)."""
+    # Retries get a longer wait budget than the first attempt
+    budget = 1 + job.attempt
+
+    latency = paced_get(driver, scheduler, job.job_url, timer, phase="navigate")
+    with timer.phase("classify"):
+        page_state, classify_ms = classify_job_page(driver, waits.timeout("classify", budget))
+    took = f"[classified in {classify_ms:.0f} ms]"
+    if page_state != UNKNOWN:
+        waits.record("classify", classify_ms / 1000)
+
+    if page_state == UNKNOWN:
+        reason = page_throttle_reason(driver)
+        if reason:
+            # Not the job's fault: leave it for the retry lane instead of marking it manual
+            scheduler.on_throttle(reason)
+            raise ThrottledError(reason)
+    else:
+        scheduler.on_success(latency)
+
+    outcome = record_page_state(job, page_state, took)
+    if outcome:
+        return outcome
+
+    try:
+        if page_state != APPLYABLE:
+            # The classifier already spent the whole timeout without seeing an Apply button
+            raise TimeoutException(f"page classified as {page_state}")
+        with timer.phase("apply_click"):
+            apply_button = waits.until(
+                driver, "apply_button", EC.element_to_be_clickable((By.XPATH, "//*[text()='Apply']")), budget
+            )
             apply_button.click()
-            wait.until(
+        with timer.phase("confirm"):
+            waits.until(
+                driver, "confirm",
                 EC.any_of(
                     EC.presence_of_element_located((By.CLASS_NAME, "applied-job-content")),
                     EC.presence_of_element_located((By.CLASS_NAME, "apply-message"))
-                )
+                ),
+                budget,
             )
-            success_apply += 1
-            line_no += 1
-            logging.info(f"{line_no} Successfully Applied ({success_apply}) - {company_name}")
-            success_applied_queue.put((company_name, experience, location, job_url))
-        except TimeoutException:
-            error_apply += 1
-            line_no += 1
-            logging.error(f"{line_no} Manual Apply Needed ({error_apply}) - {company_name}")
-            failed_jobs_queue.put((company_name, experience, location, job_url))
-            manual_jobs_urls.add(job_url)
+        return record_applied(job, took)
+    except TimeoutException:
+        return record_timeout(job, took)
+
+def finish_job(dispatcher, job, outcome, timer):
+    """Books the end of a job's turn (outcome None = claim_job() passed on it).
+
+    Returns the next job parked behind the same company, if any.
+    """
+    succeeded = outcome != "error"
+    if outcome is not None:
+        metrics.record(job.job_url, outcome, timer, company=job.company_name)
+        command_profiler.item_done(job.job_url)
+        with state_lock:
+            in_flight_keys.discard(job_key(job.job_url))
+    if outcome in ("deferred", "throttled"):
+        succeeded = False
+        if job.attempt + 1 < MAX_ATTEMPTS:
+            dispatcher.defer(job._replace(attempt=job.attempt + 1))
+        else:
+            logging.warning(f"Giving up on {job.job_url} for this run, it is retried next run")
+    if succeeded:
+        checkpoint.finished(job.row, line_no)
+    else:
+        checkpoint.failed(job.row, line_no)
+    return dispatcher.release(job)
+
+def run_job(supervisor, job, timer):
+    """process_job() on the supervisor's browser. Returns the outcome ("error" = failed this run).
+
+    A job cut short because the browser died is run again on its replacement,
+    without counting as one of the job's attempts.
+    """
+    for restart in range(JOB_RESTARTS + 1):
+        try:
+            return process_job(supervisor.driver, job, timer)
+        except ThrottledError as e:
+            logging.warning(f"Throttle page instead of {job.job_url} ({e})")
+            return "throttled"
+        except Exception as e:
+            if supervisor.crashed(e) and restart < JOB_RESTARTS:
+                logging.warning(f"🔁 Running {job.job_url} again on the new browser")
+                continue
+            logging.error(f"Error processing {job.job_url}: {e}")
+            return "error"
+
+def abandon(dispatcher, job):
+    """Hands back a job (and the jobs parked behind it) this worker can no longer run;
+    they stay unfinished in the checkpoint, so the next run retries them."""
+    while job is not None:
+        with state_lock:
+            in_flight_keys.discard(job_key(job.job_url))
+        checkpoint.failed(job.row, line_no)
+        job = dispatcher.release(job)
+
+def apply_worker(dispatcher, clone_as=None, driver=None):
+    # A driver handed in (by the browser daemon) is borrowed: it is only quit if it has to be replaced
+    clone = None
+    try:
+        profile_path, clone = worker_profile(clone_as)
+        supervisor = DriverSupervisor(lambda: start_worker_driver(profile_path, clone), driver, **health_options)
+        if driver is not None:
+            prepare_driver(driver, CLASSIFY_SCRIPT_TIMEOUT)
+        supervisor.start()
+    except Exception as e:
+        if clone:
+            remove_profile_clone(clone)
+        worker_stopped(dispatcher, f"could not start Firefox: {e}")
+        return
+    job = None
+    try:
+        while True:
+            job = dispatcher.acquire()
+            if job is None:
+                break
+            while job is not None:
+                outcome = None
+                timer = PhaseTimer()
+                if claim_job(job):
+                    outcome = run_job(supervisor, job, timer)
+                job = finish_job(dispatcher, job, outcome, timer)
+                if outcome is not None:
+                    supervisor.job_done(timer)
+    except BrowserUnavailable as e:
+        abandon(dispatcher, job)
+        worker_stopped(dispatcher, f"no working Firefox left: {e}")
+    except Exception as e:
+        # Never leave main() blocked on a queue nobody reads
+        logging.exception("Worker failed")
+        abandon(dispatcher, job)
+        worker_stopped(dispatcher, e)
+    finally:
+        supervisor.quit()
+        if supervisor.restarts:
+            logging.info(f"♻️ Firefox was restarted {supervisor.restarts}x in this worker")
+        if clone:
+            remove_profile_clone(clone)
 
 # ===============================
-# 🔹 CLEANUP
+# 🔹 MULTI-TAB ENGINE (one browser, WebDriver BiDi)
 # ===============================
 
-for q in [company_sites_queue, failed_jobs_queue, success_applied_queue, already_applied_queue, expired_jobs_queue]:
-    q.put(None)
+# Same conditions as the Selenium waits in process_job(), checked inside the page
+APPLY_BUTTON_JS = """
+var el = document.evaluate("//*[text()='Apply']", document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!el || !el.getClientRects().length || el.disabled) return null;
+el.scrollIntoView({block: 'center'});
+return el;
+"""
+CONFIRM_JS = "return document.querySelector('.applied-job-content, .apply-message') !== null;"
+
+async def process_job_in_tab(tab, job, timer):
+    """process_job() for one tab of the shared browser; the waits overlap with the other tabs."""
+    budget = 1 + job.attempt
+
+    with timer.phase("pace"):
+        await asyncio.to_thread(scheduler.acquire)
+    started = time.perf_counter()
+    with timer.phase("navigate"):
+        try:
+            await tab.navigate(job.job_url)
+        except TimeoutException:
+            scheduler.on_timeout()
+            raise
+    latency = time.perf_counter() - started
+
+    with timer.phase("classify"):
+        page_state, classify_ms = await classify_tab(tab, waits.timeout("classify", budget))
+    took = f"[classified in {classify_ms:.0f} ms]"
+    if page_state != UNKNOWN:
+        waits.record("classify", classify_ms / 1000)
+
+    if page_state == UNKNOWN:
+        reason = await tab_throttle_reason(tab)
+        if reason:
+            scheduler.on_throttle(reason)
+            raise ThrottledError(reason)
+    else:
+        scheduler.on_success(latency)
+
+    outcome = record_page_state(job, page_state, took)
+    if outcome:
+        return outcome
+
+    try:
+        if page_state != APPLYABLE:
+            raise TimeoutException(f"page classified as {page_state}")
+        with timer.phase("apply_click"):
+            started = time.perf_counter()
+            apply_button = await tab.wait_for(APPLY_BUTTON_JS, waits.timeout("apply_button", budget))
+            waits.record("apply_button", time.perf_counter() - started)
+            await tab.click(apply_button)
+        with timer.phase("confirm"):
+            started = time.perf_counter()
+            await tab.wait_for(CONFIRM_JS, waits.timeout("confirm", budget))
+            waits.record("confirm", time.perf_counter() - started)
+        return record_applied(job, took)
+    except TimeoutException:
+        return record_timeout(job, took)
+
+class TabBrowser:
+    """The one browser of the multi-tab engine and its BiDi session, replaced together when the browser dies.
+
+    Every tab that hits a dead browser calls recover(); the first one restarts
+    it through the DriverSupervisor, the others find it already replaced
+    (`generation` moved on) and just open a new tab.
+    """
+
+    def __init__(self, supervisor):
+        self.supervisor = supervisor
+        self.session = None
+        self.timeouts = None
+        self.generation = 0
+        self.lost = None        # BrowserUnavailable once no replacement would start
+        self.lock = asyncio.Lock()
+
+    async def connect(self):
+        driver = self.supervisor.driver
+        self.session = await BiDiSession(driver).connect()
+        self.timeouts = {"page_load_timeout": driver.timeouts.page_load,
+                         "script_timeout": CLASSIFY_SCRIPT_TIMEOUT + 5}
+
+    async def open_tab(self):
+        """(tab, generation of the browser it belongs to)."""
+        return await BiDiTab.open(self.session, **self.timeouts), self.generation
+
+    async def recover(self, generation, error):
+        """After a tab command raised `error`: a new (tab, generation) if the browser had died, else None.
+
+        Raises BrowserUnavailable when no replacement browser would start.
+        """
+        if isinstance(error, TimeoutException):
+            return None
+        async with self.lock:
+            if self.lost is not None:
+                raise self.lost
+            if self.generation == generation:
+                if await asyncio.to_thread(self.supervisor.alive):
+                    return None
+                await self.close()
+                try:
+                    await asyncio.to_thread(self.supervisor.replace, f"browser lost: {str(error).strip()}")
+                    await self.connect()
+                except Exception as e:
+                    self.lost = e if isinstance(e, BrowserUnavailable) else BrowserUnavailable(str(e))
+                    raise self.lost
+                self.generation += 1
+            try:
+                return await self.open_tab()
+            except Exception as e:
+                raise BrowserUnavailable(f"could not open a tab on the new browser: {e}") from e
+
+    async def close(self):
+        if self.session is not None:
+            session, self.session = self.session, None
+            try:
+                await session.close()
+            except Exception:
+                pass  # the browser is already gone
+
+async def run_job_in_tab(browser, slot, job, timer):
+    """process_job_in_tab() on slot[0]; a job cut short by the browser dying is run again on its replacement."""
+    for restart in range(JOB_RESTARTS + 1):
+        tab, generation = slot
+        try:
+            return await process_job_in_tab(tab, job, timer)
+        except ThrottledError as e:
+            logging.warning(f"Throttle page instead of {job.job_url} ({e})")
+            return "throttled"
+        except Exception as e:
+            replacement = await browser.recover(generation, e)
+            if replacement is not None:
+                slot[:] = replacement
+                if restart < JOB_RESTARTS:
+                    logging.warning(f"🔁 Running {job.job_url} again on the new browser")
+                    continue
+            logging.error(f"Error processing {job.job_url}: {e}")
+            return "error"
+
+async def tab_worker(dispatcher, browser):
+    slot = list(await browser.open_tab())
+    job = None
+    try:
+        while True:
+            job = await asyncio.to_thread(dispatcher.acquire)
+            if job is None:
+                break
+            while job is not None:
+                if slot[1] != browser.generation:
+                    # The browser was replaced while this tab was idle
+                    slot[:] = await browser.recover(slot[1], BiDiError("tab of a replaced browser"))
+                outcome = None
+                timer = PhaseTimer()
+                if claim_job(job):
+                    outcome = await run_job_in_tab(browser, slot, job, timer)
+                job = finish_job(dispatcher, job, outcome, timer)
+    except BrowserUnavailable:
+        abandon(dispatcher, job)
+        raise
+    finally:
+        if slot[1] == browser.generation and browser.session is not None:
+            try:
+                await slot[0].close()
+            except Exception:
+                pass  # the session went down with the browser
+
+async def run_tabs(dispatcher, supervisor, tabs):
+    # Tabs wait for the dispatcher and the rate scheduler in threads; every tab may do both at once
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2 * tabs + 2))
+    browser = TabBrowser(supervisor)
+    await browser.connect()
+    logging.info(f"🗂️ Applying in {tabs} tabs of one browser")
+    try:
+        results = await asyncio.gather(*(tab_worker(dispatcher, browser) for _ in range(tabs)),
+                                       return_exceptions=True)
+    finally:
+        await browser.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+def apply_in_tabs(dispatcher, tabs, clone_as=None, driver=None):
+    """Thread target: drives `tabs` tabs of one browser on an asyncio loop."""
+    clone = None
+    try:
+        profile_path, clone = worker_profile(clone_as)
+        # Only crash recovery: recycling would have to stop every tab in the middle of its job
+        supervisor = DriverSupervisor(lambda: start_worker_driver(profile_path, clone), driver)
+        supervisor.start()
+    except Exception as e:
+        if clone:
+            remove_profile_clone(clone)
+        worker_stopped(dispatcher, f"could not start Firefox: {e}")
+        return
+    try:
+        asyncio.run(run_tabs(dispatcher, supervisor, tabs))
+    except BrowserUnavailable as e:
+        worker_stopped(dispatcher, f"no working Firefox left: {e}")
+    except Exception as e:
+        # No BiDi connection, a tab that would not open, ...: let main() finish feeding the queue
+        worker_stopped(dispatcher, f"multi-tab mode failed: {e}")
+    finally:
+        supervisor.quit()
+        if supervisor.restarts:
+            logging.info(f"♻️ Firefox was restarted {supervisor.restarts}x in multi-tab mode")
+        if clone:
+            remove_profile_clone(clone)
 
-for t in [company_thread, failed_thread, success_thread, already_applied_thread, expired_jobs_thread]:
-    t.join()
+# ===============================
+# 🔹 MAIN JOB LOOP
+# ===============================
 
-driver.quit()
-logging.info("✅ Process Completed Successfully!")
+def main(argv=None, driver=None):
+    """Runs one apply pass. `driver` lets the browser daemon lend its warm, logged-in Firefox."""
+    global ledger, company_list, checkpoint, line_no, sink, metrics, scheduler, waits
+    global PROFILE_PATH, CSV_FILE, driver_options, health_options, clone_prefs, run_started, workers_running
+    global success_apply, error_apply, already_applied, company_sites_count, expired_jobs_count
+
+    run_started = time.monotonic()
+    parser = argparse.ArgumentParser(description="Apply to the jobs listed in Delete_me/jobs.csv")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of Firefox workers applying in parallel (default: 1)")
+    parser.add_argument("--tabs", type=int, default=0,
+                        help="apply in this many tabs of ONE browser instead of one browser per worker "
+                             "(WebDriver BiDi, needs the websockets package; default: 0 = off)")
+    parser.add_argument("--restart", action="store_true",
+                        help="ignore the saved checkpoint and start from the top of jobs.csv")
+    parser.add_argument("--durability", choices=DURABILITY_CHOICES, default="flush",
+                        help="how hard result CSV batches are pushed to disk (default: flush)")
+    parser.add_argument("--lean", action="store_true",
+                        help="skip images, fonts, media and tracker/ad hosts (runs on a profile copy)")
+    parser.add_argument("--metrics-every", type=int, default=60,
+                        help="seconds between throughput / phase timing reports (default: 60)")
+    parser.add_argument("--rate", type=float, default=20,
+                        help="job pages per minute to start at (all workers together); adapts to the site (default: 20)")
+    parser.add_argument("--max-rate", type=float, default=60,
+                        help="job pages per minute never to exceed (default: 60)")
+    parser.add_argument("--csv", default="./Delete_me/jobs.csv",
+                        help="jobs file to apply from (default: ./Delete_me/jobs.csv)")
+    parser.add_argument("--recycle-every", type=int, default=400,
+                        help="restart each browser after this many jobs (default: 400, 0 = never)")
+    parser.add_argument("--max-browser-mb", type=int, default=2000,
+                        help="restart a browser using more memory than this (needs psutil; default: 2000, 0 = off)")
+    parser.add_argument("--max-slowdown", type=float, default=2.0,
+                        help="restart a browser once its pages load this many times slower than when it "
+                             "was fresh (default: 2.0, 0 = off)")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="time every WebDriver command and report the slowest ones per job at the end")
+    parser.add_argument("--headless", action="store_true", help="run Firefox without a window")
+    parser.add_argument("--no-profile", action="store_true",
+                        help="use a fresh temporary Firefox profile instead of your logged-in one (benchmarks)")
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+    tabs = max(0, args.tabs)
+    if tabs and workers > 1:
+        logging.warning("--tabs runs one browser: --workers is ignored")
+        workers = 1
+
+    CSV_FILE = args.csv
+    PROFILE_PATH = None if args.no_profile else get_firefox_profile()
+    driver_options = {"headless": args.headless, "bidi": bool(tabs)}
+    health_options = {"recycle_every": max(0, args.recycle_every), "max_rss_mb": max(0, args.max_browser_mb),
+                      "max_slowdown": max(0.0, args.max_slowdown)}
+
+    success_apply = error_apply = already_applied = company_sites_count = expired_jobs_count = 0
+    line_no = 0
+    in_flight_keys.clear()
+
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    if workers > 1 or tabs > 1:
+        log_format = "%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s"
+    logging.basicConfig(level=logging.INFO, format=log_format)
+
+    # A single normal worker keeps using the real profile. A pool needs one copy
+    # per browser, and lean prefs only ever go into copies.
+    use_clones = PROFILE_PATH is not None and (workers > 1 or args.lean)
+    clone_prefs = LEAN_PREFS if args.lean else None
+    if PROFILE_PATH is None:
+        # Every worker gets its own throwaway profile from geckodriver
+        driver_options["lean"] = args.lean
+    if use_clones:
+        clone_names = [f"worker_{i + 1}" for i in range(workers)]
+    else:
+        clone_names = [None] * workers
+
+    # The warm driver runs on the real profile, so it can only stand in for a single normal worker
+    if driver is not None and (use_clones or PROFILE_PATH is None):
+        logging.info("Warm browser not used: --workers/--lean/--no-profile need their own browsers")
+        driver = None
+    if driver is not None and tabs and not isinstance(driver.caps.get("webSocketUrl"), str):
+        logging.info("Warm browser not used: it was started without BiDi (restart the browser daemon)")
+        driver = None
+
+    if args.profile_commands:
+        if tabs:
+            logging.info("--profile-commands sees classic WebDriver commands only, not the BiDi tabs")
+        command_profiler.start("apply")
+
+    # Set before the workers start; the rest of the run state is loaded while their browsers boot
+    ledger = sink = metrics = checkpoint = None
+    scheduler = RateScheduler(rate=args.rate / 60, max_rate=args.max_rate / 60, name="job page")
+    waits = AdaptiveWaits()
+
+    if tabs:
+        # One thread runs every tab; each tab takes jobs (and a stop signal) like a worker
+        stop_signals = tabs
+        dispatcher = CompanyDispatcher(maxsize=tabs * 4)
+        worker_threads = [threading.Thread(target=apply_in_tabs, args=(dispatcher, tabs, clone_names[0], driver),
+                                           name="tabs")]
+    else:
+        stop_signals = workers
+        dispatcher = CompanyDispatcher(maxsize=workers * 4)
+        worker_threads = [
+            threading.Thread(target=apply_worker, args=(dispatcher, clone_as, driver), name=f"worker-{i + 1}")
+            for i, clone_as in enumerate(clone_names)
+        ]
+    workers_running = len(worker_threads)
+    for t in worker_threads:
+        t.start()
+
+    def dispatch(start, end, job):
+        checkpoint.dispatched(start, end)
+        dispatcher.put(Job(
+            job["Company Name"].strip(),
+            (job.get("Experience Required") or job.get("Experience", "")).strip(),
+            job.get("Location", "").strip(),
+            job["Link"].strip(),
+            start,
+        ))
+
+    try:
+        ledger = open_ledger()
+        company_list = CompanyIndex(ledger.company_keys())
+
+        checkpoint = RunCheckpoint(CSV_FILE)
+        if not args.restart and checkpoint.load():
+            line_no = checkpoint.line_no
+            logging.info(f"⏩ Resuming {CSV_FILE} at byte {checkpoint.resume_offset} "
+                         f"({len(checkpoint.retry)} rows to retry, {len(checkpoint.done)} finished further on)")
+
+        exit_on_sigterm()
+        sink = CsvSink(durability=args.durability)
+        for file_path in RESULT_CSVS:
+            sink.register(file_path, headers)
+        sink.register(COMPANY_LIST_CSV, ["Company Name"])
+        metrics = RunMetrics("apply", unit="jobs", report_every=args.metrics_every, started=run_started)
+        logging.info(f"📚 Ledger and checkpoint ready in {time.monotonic() - run_started:.1f}s "
+                     f"({len(company_list)} company-site employers)")
+
+        # Rows that errored last time first, then straight on from the first unfinished row
+        retry_rows = set(checkpoint.retry)
+        for offset in sorted(retry_rows):
+            row = read_csv_row(CSV_FILE, offset)
+            if row:
+                dispatch(*row)
+
+        for start, end, job in iter_csv_rows(CSV_FILE, checkpoint.resume_offset):
+            if start not in retry_rows and not checkpoint.is_done(start):
+                dispatch(start, end, job)
+    finally:
+        dispatcher.close(stop_signals)
+        for t in worker_threads:
+            t.join()
+
+        # ===============================
+        # 🔹 CLEANUP
+        # ===============================
+
+        if sink is not None:
+            sink.close()
+        if ledger is not None:
+            ledger.close()
+        if metrics is not None:
+            metrics.summary()
+        command_profiler.stop("jobs")
+        logging.info(f"Pace at the end: {scheduler.describe()}")
+        logging.info(f"Wait timeouts at the end: {waits.describe()}")
+
+    logging.info("✅ Process Completed Successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from firefox_setup import get_firefox_profile
+from http_scraper import make_session, REQUEST_TIMEOUT, THROTTLE_RETRIES
+from job_ids import JobKeyIndex, job_key
+from job_ledger import open_ledger
+from company_index import CompanyIndex
+from csv_sink import CsvSink, DURABILITY_CHOICES, exit_on_sigterm
+from run_metrics import RunMetrics, PhaseTimer
+from run_checkpoint import iter_csv_rows
+from rate_scheduler import RateScheduler, THROTTLE_STATUSES, response_throttle_reason
+from session_check import add_cookies, profile_cookies, load_saved_cookies
+from page_classifier import EXPIRED, ALREADY_APPLIED, COMPANY_SITE, UNKNOWN, classify_html
+
+# ===============================
+# 🔹 FILES
+# ===============================
+
+already_applied_folder = "./Already_applied_folder"
+SCRAPED_CSV = "./Delete_me/jobs.csv"
+# Jobs only a browser can finish; Second_Run.py --csv applies from this file
+APPLY_CSV = "./Delete_me/jobs_to_apply.csv"
+
+COMPANY_SITES_CSV = os.path.join(already_applied_folder, "company_sites.csv")
+ALREADY_APPLIED_CSV = os.path.join(already_applied_folder, "already_applied.csv")
+EXPIRED_JOBS_CSV = os.path.join(already_applied_folder, "expired_jobs.csv")
+COMPANY_LIST_CSV = os.path.join(already_applied_folder, "company_list.csv")
+
+headers = ["Company Name", "Experience", "Location", "Link"]
+
+# Page state -> (ledger status, result file) for the outcomes triage settles itself
+SETTLED = {
+    EXPIRED: ("expired", EXPIRED_JOBS_CSV),
+    ALREADY_APPLIED: ("already_applied", ALREADY_APPLIED_CSV),
+    COMPANY_SITE: ("company_site", COMPANY_SITES_CSV),
+}
+
+# ===============================
+# 🔹 RUN STATE (set up by main())
+# ===============================
+
+ledger = None
+sink = None
+metrics = None
+scheduler = None
+company_list = CompanyIndex()
+# Jobs already handed to the browser by an earlier triage run
+handed_on = JobKeyIndex()
+
+state_lock = threading.Lock()
+counts = {}
+
+def count(outcome):
+    with state_lock:
+        counts[outcome] = counts.get(outcome, 0) + 1
+        return sum(counts.values())
+
+# ===============================
+# 🔹 ONE JOB
+# ===============================
+
+def fetch_state(session, url, timer):
+    """Fetches the job page and classifies its HTML; UNKNOWN when only a browser can tell."""
+    for attempt in range(THROTTLE_RETRIES + 1):
+        with timer.phase("pace"):
+            scheduler.acquire()
+        started = time.perf_counter()
+        with timer.phase("fetch"):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+        latency = time.perf_counter() - started
+
+        if response.status_code in THROTTLE_STATUSES:
+            scheduler.on_throttle(f"HTTP {response.status_code}")
+            continue
+        page_state = UNKNOWN
+        if response.status_code == 200:
+            with timer.phase("parse"):
+                page_state = classify_html(response.text)
+        if page_state == UNKNOWN:
+            # Only a page that shows none of the job states can be a captcha / block page
+            reason = response_throttle_reason(response)
+            if reason:
+                scheduler.on_throttle(reason)
+                continue
+        scheduler.on_success(latency)
+        return page_state
+    return UNKNOWN
+
+def triage_job(session, job):
+    """Settles the job if its page already says expired / applied / company site, else hands it on."""
+    company, link = job["Company Name"].strip(), job["Link"].strip()
+    # First_Run.py writes "Experience Required", the result files "Experience"
+    experience = job.get("Experience Required") or job.get("Experience", "")
+    row = [company, experience.strip(), job.get("Location", "").strip(), link]
+    timer = PhaseTimer()
+
+    if company in company_list:
+        page_state = COMPANY_SITE
+    else:
+        try:
+            page_state = fetch_state(session, link, timer)
+        except Exception as e:
+            logging.warning(f"Could not fetch {link}, leaving it to the browser: {e}")
+            page_state = UNKNOWN
+
+    if page_state in SETTLED:
+        status, file_path = SETTLED[page_state]
+        with state_lock:
+            if ledger.record(link, status, *row[:3]):
+                sink.put(file_path, row)
+            if page_state == COMPANY_SITE and company_list.add(company) and ledger.add_company(company):
+                sink.put(COMPANY_LIST_CSV, [company])
+        outcome = status
+        logging.info(f"{count(outcome)} {status.replace('_', ' ').title()} - {company}")
+    else:
+        sink.put(APPLY_CSV, row)
+        outcome = "to_browser"
+        logging.info(f"{count(outcome)} For the browser ({page_state}) - {company}")
+
+    metrics.record(link, outcome, timer, company=company)
+
+# ===============================
+# 🔹 TRIAGE RUN
+# ===============================
+
+def pending_jobs(csv_path):
+    """Rows of the scraped file that no run has settled or handed to the browser yet."""
+    seen = JobKeyIndex()
+    for _, _, job in iter_csv_rows(csv_path):
+        link = job.get("Link", "").strip()
+        if not link:
+            continue
+        key = job_key(link)
+        if key in seen or key in handed_on or link in ledger:
+            continue
+        seen.add(key)
+        yield job
+
+def main(argv=None):
+    global ledger, sink, metrics, scheduler, company_list, handed_on, counts, APPLY_CSV
+
+    parser = argparse.ArgumentParser(
+        description="Settle expired / already-applied / company-site jobs over plain HTTP before Second_Run.py")
+    parser.add_argument("--csv", default=SCRAPED_CSV, help=f"scraped jobs to triage (default: {SCRAPED_CSV})")
+    parser.add_argument("--out", default=APPLY_CSV,
+                        help=f"jobs left for the browser, for Second_Run.py --csv (default: {APPLY_CSV})")
+    parser.add_argument("--concurrency", type=int, default=8, help="job pages fetched in parallel (default: 8)")
+    parser.add_argument("--rate", type=float, default=60,
+                        help="job pages per minute to start at; adapts to how the site responds (default: 60)")
+    parser.add_argument("--max-rate", type=float, default=240,
+                        help="job pages per minute never to exceed (default: 240)")
+    parser.add_argument("--durability", choices=DURABILITY_CHOICES, default="flush",
+                        help="how hard result CSV batches are pushed to disk (default: flush)")
+    parser.add_argument("--metrics-every", type=int, default=60,
+                        help="seconds between throughput / timing reports (default: 60)")
+    parser.add_argument("--no-profile", action="store_true",
+                        help="fetch without the Naukri cookies of your Firefox profile (benchmarks)")
+    args = parser.parse_args(argv)
+    APPLY_CSV = args.out
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if not os.path.exists(args.csv):
+        logging.error(f"{args.csv} not found. Run First_Run.py first.")
+        return
+
+    os.makedirs(already_applied_folder, exist_ok=True)
+    ledger = open_ledger()
+    company_list = CompanyIndex(ledger.company_keys())
+    handed_on = JobKeyIndex()
+    if os.path.exists(APPLY_CSV):
+        for _, _, job in iter_csv_rows(APPLY_CSV):
+            if job.get("Link"):
+                handed_on.add_url(job["Link"].strip())
+    counts = {}
+
+    exit_on_sigterm()
+    sink = CsvSink(durability=args.durability)
+    for file_path in [APPLY_CSV, COMPANY_SITES_CSV, ALREADY_APPLIED_CSV, EXPIRED_JOBS_CSV]:
+        sink.register(file_path, headers)
+    sink.register(COMPANY_LIST_CSV, ["Company Name"])
+    metrics = RunMetrics("triage", unit="jobs", report_every=args.metrics_every)
+    scheduler = RateScheduler(rate=args.rate / 60, max_rate=args.max_rate / 60, name="job page")
+
+    # Logged in, so already-applied jobs show their marker
+    cookies = [] if args.no_profile else (profile_cookies(get_firefox_profile()) or load_saved_cookies())
+    concurrency = max(1, args.concurrency)
+    session = make_session(pool_size=concurrency)
+    add_cookies(session, cookies)
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="triage") as pool:
+            # Bounded submission keeps a huge jobs.csv from being queued up all at once
+            pending = []
+            for job in pending_jobs(args.csv):
+                pending.append(pool.submit(triage_job, session, job))
+                if len(pending) >= concurrency * 4:
+                    pending.pop(0).result()
+            for future in pending:
+                future.result()
+    finally:
+        session.close()
+        sink.close()
+        ledger.close()
+        metrics.summary()
+
+        logging.info("📊 Triage Summary →")
+        for outcome, number in sorted(counts.items()):
+            logging.info(f"  {outcome}: {number}")
+        logging.info(f"Pace at the end: {scheduler.describe()}")
+        logging.info(f"✅ Jobs for the browser are in {APPLY_CSV}")
+
+if __name__ == "__main__":
+    main()
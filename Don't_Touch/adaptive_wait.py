@@ -0,0 +1,58 @@
+import time
+import math
+import threading
+from collections import deque
+from selenium.webdriver.support.ui import WebDriverWait
+
+# ===============================
+# 🔹 LATENCY-BASED WAIT TIMEOUTS
+# ===============================
+
+DEFAULT_TIMEOUT = 10    # seconds, until enough waits have been observed
+MIN_SAMPLES = 8
+SAMPLE_WINDOW = 200     # recent successful waits kept per page type
+HEADROOM = 2.0          # timeout = p95 * HEADROOM + SLACK
+SLACK = 1.0
+MIN_TIMEOUT = 3
+MAX_TIMEOUT = 30
+
+class AdaptiveWaits:
+    """Wait timeouts per page type ("classify", "apply_button", ...) derived from observed latency.
+
+    Successful waits are recorded; the timeout for a type is its recent p95
+    with headroom, clamped to [MIN_TIMEOUT, MAX_TIMEOUT]. `budget` scales it
+    for retries. Thread-safe, so all workers learn from each other.
+    """
+
+    def __init__(self, default=DEFAULT_TIMEOUT, min_timeout=MIN_TIMEOUT, max_timeout=MAX_TIMEOUT):
+        self.default = default
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, kind, seconds):
+        with self.lock:
+            self.samples.setdefault(kind, deque(maxlen=SAMPLE_WINDOW)).append(seconds)
+
+    def timeout(self, kind, budget=1.0):
+        with self.lock:
+            values = sorted(self.samples.get(kind, ()))
+        if len(values) < MIN_SAMPLES:
+            base = self.default
+        else:
+            p95 = values[max(0, math.ceil(0.95 * len(values)) - 1)]
+            base = min(self.max_timeout, max(self.min_timeout, p95 * HEADROOM + SLACK))
+        return base * budget
+
+    def until(self, driver, kind, condition, budget=1.0):
+        """WebDriverWait(...).until(condition) with the adaptive timeout; records how long it took."""
+        started = time.perf_counter()
+        result = WebDriverWait(driver, self.timeout(kind, budget)).until(condition)
+        self.record(kind, time.perf_counter() - started)
+        return result
+
+    def describe(self):
+        with self.lock:
+            kinds = list(self.samples)
+        return ", ".join(f"{kind} {self.timeout(kind):.1f}s" for kind in kinds) or "defaults"
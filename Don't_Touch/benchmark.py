@@ -0,0 +1,227 @@
+import os
+import sys
+import csv
+import json
+import time
+import glob
+import shlex
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from fake_naukri import FakeNaukri, DEFAULT_MIX, parse_mix
+from firefox_setup import COMMAND_COUNTS_ENV
+
+try:
+    import psutil
+except ImportError:  # optional: peak memory is reported as n/a without it
+    psutil = None
+
+# ===============================
+# 🔹 BENCHMARK SETUP
+# ===============================
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join("Delete_me", "benchmark_results.jsonl")
+MEMORY_POLL_SECONDS = 0.5
+# The stand-in site never throttles: pace it far above anything the code can reach, so the
+# benchmark measures the bots and not the rate scheduler's ramp (--paced keeps the real pacing)
+UNPACED_ARGS = ["--rate", "100000", "--max-rate", "100000"]
+
+class PeakMemory:
+    """Polls the RSS of a process and all its children (geckodriver, Firefox)."""
+
+    def __init__(self, pid):
+        self.peak_mb = None
+        self._stop = threading.Event()
+        if psutil is not None:
+            self._process = psutil.Process(pid)
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+
+    def _poll(self):
+        self.peak_mb = 0.0
+        while not self._stop.is_set():
+            try:
+                processes = [self._process] + self._process.children(recursive=True)
+                rss = 0
+                for process in processes:
+                    try:
+                        rss += process.memory_info().rss
+                    except psutil.Error:
+                        pass
+                self.peak_mb = max(self.peak_mb, rss / 1024 / 1024)
+            except psutil.Error:
+                break
+            self._stop.wait(MEMORY_POLL_SECONDS)
+
+    def stop(self):
+        self._stop.set()
+        return self.peak_mb
+
+def run_stage(name, script, args, workdir, log_file):
+    """Runs one bot script in the benchmark folder. Returns wall time, command counts and peak memory."""
+    counts_path = os.path.join(workdir, f"{name}_commands.json")
+    env = dict(os.environ, **{COMMAND_COUNTS_ENV: counts_path})
+    command = [sys.executable, os.path.join(SCRIPT_DIR, script)] + args
+
+    started = time.perf_counter()
+    with open(log_file, 'a', encoding='utf-8') as log:
+        process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL)
+        memory = PeakMemory(process.pid)
+        returncode = process.wait()
+    peak_mb = memory.stop()
+    wall = time.perf_counter() - started
+
+    commands = {}
+    if os.path.exists(counts_path):
+        with open(counts_path, 'r', encoding='utf-8') as f:
+            commands = json.load(f)
+    if returncode != 0:
+        logging.error(f"❌ {script} exited with {returncode}, see {log_file}")
+    return {"wall_s": round(wall, 2), "returncode": returncode, "commands": sum(commands.values()),
+            "command_counts": commands, "peak_mb": round(peak_mb, 1) if peak_mb is not None else None}
+
+def _count_rows(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+def _apply_outcomes(workdir):
+    outcomes = {}
+    for path in glob.glob(os.path.join(workdir, "Delete_me", "metrics", "apply_*.jsonl")):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                outcome = json.loads(line)["outcome"]
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return outcomes
+
+# ===============================
+# 🔹 BENCHMARK RUN
+# ===============================
+
+def run_benchmark(args):
+    server = FakeNaukri(pages=args.pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        render_ms=args.render_ms, mix=args.mix, ssr=args.ssr).start()
+    workdir = tempfile.mkdtemp(prefix="naukri_bench_")
+    log_file = os.path.join(workdir, "benchmark.log")
+    logging.info(f"🧪 Stand-in site {server.base_url}, working folder {workdir}")
+
+    result = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        # Everything that shapes the workload, so only like runs are compared
+        "scenario": {"jobs": args.jobs, "engine": args.engine, "workers": args.workers, "pages": args.pages,
+                     "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "render_ms": args.render_ms,
+                     "mix": dict(args.mix or DEFAULT_MIX), "ssr": args.ssr,
+                     "stages": args.stages, "paced": args.paced,
+                     "scrape_args": args.scrape_args, "apply_args": args.apply_args},
+    }
+    pacing = [] if args.paced else UNPACED_ARGS
+    try:
+        if "scrape" in args.stages:
+            scrape = run_stage("scrape", "First_Run.py",
+                               ["--engine", args.engine, "--url", f"{server.base_url}/python-jobs",
+                                "--target", str(args.jobs)] + pacing + shlex.split(args.scrape_args),
+                               workdir, log_file)
+            scrape["jobs"] = _count_rows(os.path.join(workdir, "Delete_me", "jobs.csv"))
+            result["scrape"] = scrape
+
+        jobs_csv = os.path.join(workdir, "Delete_me", "jobs.csv")
+        if "triage" in args.stages:
+            triage = run_stage("triage", "Triage.py", ["--no-profile"] + pacing, workdir, log_file)
+            triage["jobs"] = _count_rows(jobs_csv)
+            jobs_csv = os.path.join(workdir, "Delete_me", "jobs_to_apply.csv")
+            triage["to_browser"] = _count_rows(jobs_csv)
+            result["triage"] = triage
+
+        if "apply" in args.stages:
+            if not os.path.exists(jobs_csv):
+                raise SystemExit("The apply stage needs the scrape stage (it applies to what was scraped)")
+            apply = run_stage("apply", "Second_Run.py",
+                              ["--csv", jobs_csv, "--headless", "--no-profile", "--restart",
+                               "--workers", str(args.workers)] + pacing + shlex.split(args.apply_args),
+                              workdir, log_file)
+            apply["outcomes"] = _apply_outcomes(workdir)
+            apply["jobs"] = sum(apply["outcomes"].values())
+            result["apply"] = apply
+    finally:
+        server.shutdown()
+        server.server_close()
+        if args.keep:
+            logging.info(f"Benchmark files kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    for stage in ("scrape", "triage", "apply"):
+        if stage in result:
+            data = result[stage]
+            data["jobs_per_min"] = round(data["jobs"] * 60 / data["wall_s"], 1) if data["wall_s"] else 0
+            data["commands_per_job"] = round(data["commands"] / data["jobs"], 1) if data["jobs"] else None
+    return result
+
+def report(result, previous):
+    logging.info(f"📊 Benchmark results ({result['label'] or 'unlabelled'}) →")
+    for stage in ("scrape", "triage", "apply"):
+        if stage not in result:
+            continue
+        data = result[stage]
+        peak = f"{data['peak_mb']:.0f} MB" if data["peak_mb"] is not None else "n/a (pip install psutil)"
+        line = (f"  {stage:6}: {data['jobs']} jobs in {data['wall_s']:.1f}s = {data['jobs_per_min']} jobs/min, "
+                f"{data['commands_per_job']} WebDriver commands/job, peak memory {peak}")
+        if previous and stage in previous and previous[stage]["jobs_per_min"]:
+            change = 100 * (data["jobs_per_min"] / previous[stage]["jobs_per_min"] - 1)
+            line += f" ({change:+.0f}% jobs/min vs {previous['label'] or previous['ts']})"
+        logging.info(line)
+        if "to_browser" in data:
+            logging.info(f"          {data['to_browser']} of {data['jobs']} jobs left for the browser")
+        if data.get("outcomes"):
+            logging.info("          outcomes: " + ", ".join(f"{k} {v}" for k, v in sorted(data["outcomes"].items())))
+
+def load_previous(path, scenario):
+    """Latest earlier result with the same scenario, for the run-to-run comparison."""
+    previous = None
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.get("scenario") == scenario:
+                    previous = entry
+    return previous
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(
+        description="Run First_Run.py and Second_Run.py headless against a local stand-in Naukri site")
+    parser.add_argument("--jobs", type=int, default=60, help="jobs to scrape and then apply to (default: 60)")
+    parser.add_argument("--stages", nargs="+", choices=["scrape", "triage", "apply"], default=["scrape", "apply"])
+    parser.add_argument("--engine", choices=["browser", "http"], default="browser", help="First_Run.py engine")
+    parser.add_argument("--workers", type=int, default=1, help="Second_Run.py workers")
+    parser.add_argument("--pages", type=int, default=10, help="result pages the stand-in site has")
+    parser.add_argument("--latency-ms", type=float, default=100, help="delay on every response (default: 100)")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--render-ms", type=int, default=50, help="delay before job page markers appear")
+    parser.add_argument("--ssr", action="store_true",
+                        help="stand-in job pages carry their markers in the HTML (what the triage stage reads)")
+    parser.add_argument("--mix", type=parse_mix, help="job states, e.g. apply=60,expired=10,company_site=30")
+    parser.add_argument("--paced", action="store_true",
+                        help="keep the scripts' own --rate/--max-rate pacing (default: pacing is lifted)")
+    parser.add_argument("--label", default="", help="name for this run in the results file (e.g. a commit)")
+    parser.add_argument("--results", default=RESULTS_FILE, help=f"results file (default: {RESULTS_FILE})")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark folder (CSVs, logs, metrics)")
+    parser.add_argument("--scrape-args", default="", help='extra First_Run.py arguments, e.g. "--prefetch 3"')
+    parser.add_argument("--apply-args", default="", help='extra Second_Run.py arguments, e.g. "--lean"')
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    report(result, load_previous(args.results, result["scenario"]))
+
+    os.makedirs(os.path.dirname(args.results) or ".", exist_ok=True)
+    with open(args.results, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result) + "\n")
@@ -0,0 +1,234 @@
+import json
+import asyncio
+import itertools
+from selenium.common.exceptions import TimeoutException
+
+try:
+    import websockets
+except ImportError:  # optional: only the multi-tab apply mode (Second_Run.py --tabs) needs it
+    websockets = None
+
+# ===============================
+# 🔹 WEBDRIVER BIDI CONNECTION
+# ===============================
+
+class BiDiError(Exception):
+    """A BiDi command failed or the page script threw."""
+
+class BiDiSession:
+    """Minimal asyncio WebDriver BiDi client for a running Selenium session.
+
+    The driver must be built with the webSocketUrl capability (build_driver(bidi=True));
+    the connection attaches to that session, so the classic driver stays usable.
+    Commands from many coroutines share one socket and are matched to their
+    responses by id.
+    """
+
+    def __init__(self, driver):
+        ws_url = driver.caps.get("webSocketUrl")
+        if not isinstance(ws_url, str):
+            raise BiDiError("the browser was started without WebDriver BiDi (webSocketUrl)")
+        if websockets is None:
+            raise BiDiError("the websockets package is missing (pip install websockets)")
+        self.ws_url = ws_url
+        self.ws = None
+        self.reader = None
+        self.pending = {}
+        self._ids = itertools.count(1)
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.ws_url, max_size=None)
+        self.reader = asyncio.create_task(self._read())
+        return self
+
+    async def _read(self):
+        try:
+            async for message in self.ws:
+                data = json.loads(message)
+                future = self.pending.pop(data.get("id"), None)
+                if future is None or future.done():
+                    continue  # an event, or a command we stopped waiting for
+                if data.get("type") == "error":
+                    future.set_exception(BiDiError(f"{data.get('error')}: {data.get('message')}"))
+                else:
+                    future.set_result(data.get("result", {}))
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(BiDiError("BiDi connection closed"))
+            self.pending.clear()
+
+    async def send(self, method, params, timeout=None):
+        """Sends one command and waits for its result; TimeoutException after `timeout` seconds."""
+        command_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[command_id] = future
+        await self.ws.send(json.dumps({"id": command_id, "method": method, "params": params}))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.pending.pop(command_id, None)
+            raise TimeoutException(f"{method} took longer than {timeout:.0f}s")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        if self.reader is not None:
+            await asyncio.gather(self.reader, return_exceptions=True)
+
+# ===============================
+# 🔹 VALUE CONVERSION
+# ===============================
+
+def _local_value(value):
+    """Python argument -> BiDi LocalValue."""
+    if value is None:
+        return {"type": "null"}
+    if isinstance(value, bool):
+        return {"type": "boolean", "value": value}
+    if isinstance(value, (int, float)):
+        return {"type": "number", "value": value}
+    if isinstance(value, str):
+        return {"type": "string", "value": value}
+    if isinstance(value, (list, tuple)):
+        return {"type": "array", "value": [_local_value(item) for item in value]}
+    raise TypeError(f"cannot pass {type(value).__name__} to a page script")
+
+def _python_value(remote):
+    """BiDi RemoteValue -> Python; DOM nodes stay as their RemoteValue (see BiDiTab.click)."""
+    kind = remote.get("type")
+    if kind in ("undefined", "null"):
+        return None
+    if kind in ("string", "boolean", "number"):
+        return remote.get("value")
+    if kind == "array":
+        return [_python_value(item) for item in remote.get("value", [])]
+    if kind == "object":
+        return {key: _python_value(item) for key, item in remote.get("value", [])
+                if isinstance(key, str)}
+    return remote
+
+# Wrap Selenium-style script bodies (they read `arguments`, async ones call the last argument)
+_SYNC_WRAPPER = "function () {{ return (function () {{ {body} }}).apply(this, arguments); }}"
+_ASYNC_WRAPPER = """function () {{
+    var args = Array.prototype.slice.call(arguments);
+    var self = this;
+    return new Promise(function (resolve) {{
+        args.push(resolve);
+        (function () {{ {body} }}).apply(self, args);
+    }});
+}}"""
+
+# Resolves with the first truthy result of CONDITION, or null after arguments[0] ms.
+# Re-checks on every DOM change rather than on a timer: timers in background tabs are clamped.
+WAIT_FOR_JS = """
+var condition = function () { CONDITION };
+var timeoutMs = arguments[0];
+var done = arguments[arguments.length - 1];
+var finished = false;
+var observer = null;
+var timeoutTimer = null;
+function finish(value) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timeoutTimer);
+    done(value);
+}
+function check() {
+    var value = condition();
+    if (value) finish(value);
+}
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    timeoutTimer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+# ===============================
+# 🔹 BROWSING CONTEXTS (TABS)
+# ===============================
+
+class BiDiTab:
+    """One tab of the browser, driven through a shared BiDiSession."""
+
+    def __init__(self, session, context, page_load_timeout=300, script_timeout=30):
+        self.session = session
+        self.context = context
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+
+    @classmethod
+    async def open(cls, session, **timeouts):
+        result = await session.send("browsingContext.create", {"type": "tab"}, timeout=30)
+        return cls(session, result["context"], **timeouts)
+
+    async def navigate(self, url):
+        """Loads url and waits for the load event, like driver.get()."""
+        await self.session.send("browsingContext.navigate",
+                                {"context": self.context, "url": url, "wait": "complete"},
+                                timeout=self.page_load_timeout)
+
+    async def _call(self, wrapper, script, args, timeout):
+        result = await self.session.send("script.callFunction", {
+            "functionDeclaration": wrapper.format(body=script),
+            "arguments": [_local_value(arg) for arg in args],
+            "target": {"context": self.context},
+            "awaitPromise": True,
+            "resultOwnership": "none",
+            "serializationOptions": {"maxDomDepth": 0, "maxObjectDepth": 2},
+        }, timeout=timeout or self.script_timeout)
+        if result.get("type") == "exception":
+            raise BiDiError(result.get("exceptionDetails", {}).get("text", "page script threw"))
+        return _python_value(result.get("result", {}))
+
+    async def execute_script(self, script, *args, timeout=None):
+        return await self._call(_SYNC_WRAPPER, script, args, timeout)
+
+    async def execute_async_script(self, script, *args, timeout=None):
+        return await self._call(_ASYNC_WRAPPER, script, args, timeout)
+
+    async def wait_for(self, condition_js, timeout):
+        """Waits in the page until `condition_js` (a function body) returns something truthy.
+
+        Returns that value; raises TimeoutException after `timeout` seconds, like WebDriverWait.
+        """
+        value = await self.execute_async_script(WAIT_FOR_JS.replace("CONDITION", condition_js),
+                                                int(timeout * 1000), timeout=timeout + 5)
+        if not value:
+            raise TimeoutException(f"condition not met within {timeout:.1f}s")
+        return value
+
+    async def click(self, node):
+        """Clicks a DOM node returned by a script with a real pointer, falling back to a DOM click."""
+        shared_id = node.get("sharedId") if isinstance(node, dict) else None
+        if shared_id is None:
+            raise BiDiError("click() needs a DOM node returned by a page script")
+        try:
+            await self.session.send("input.performActions", {
+                "context": self.context,
+                "actions": [{
+                    "type": "pointer", "id": "mouse", "parameters": {"pointerType": "mouse"},
+                    "actions": [
+                        {"type": "pointerMove", "x": 0, "y": 0,
+                         "origin": {"type": "element", "element": {"sharedId": shared_id}}},
+                        {"type": "pointerDown", "button": 0},
+                        {"type": "pointerUp", "button": 0},
+                    ],
+                }],
+            }, timeout=self.script_timeout)
+        except BiDiError:
+            await self.session.send("script.callFunction", {
+                "functionDeclaration": "function (el) { el.click(); }",
+                "arguments": [{"sharedId": shared_id}],
+                "target": {"context": self.context},
+                "awaitPromise": False,
+            }, timeout=self.script_timeout)
+
+    async def close(self):
+        try:
+            await self.session.send("browsingContext.close", {"context": self.context}, timeout=10)
+        except (BiDiError, TimeoutException):
+            pass
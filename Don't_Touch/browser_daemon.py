@@ -0,0 +1,378 @@
+import os
+import sys
+import json
+import time
+import logging
+import secrets
+import argparse
+import threading
+import subprocess
+from multiprocessing.connection import Listener, Client
+from selenium.common.exceptions import WebDriverException
+from firefox_setup import get_firefox_profile, build_driver
+
+# ===============================
+# 🔹 DAEMON FILES
+# ===============================
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Address + auth key of the running daemon; only clients that can read it may connect
+DAEMON_FILE = os.path.join(SCRIPT_DIR, "browser_daemon.json")
+DAEMON_LOG = os.path.join(SCRIPT_DIR, "browser_daemon.log")
+
+HOST = "127.0.0.1"
+SPAWN_TIMEOUT = 30
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# ===============================
+# 🔹 WARM BROWSER SESSIONS
+# ===============================
+
+class WarmSession:
+    """One Firefox kept running between commands, rebuilt when it stops answering."""
+
+    def __init__(self, name, factory):
+        self.name = name
+        self.factory = factory
+        self.driver = None
+        self.started_at = None
+        self.recycles = 0
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self):
+        """Starts Firefox in the background so the first command finds it warm."""
+        self._ready.clear()
+        self._error = None
+        threading.Thread(target=self._build, name=f"start-{self.name}", daemon=True).start()
+
+    def _build(self):
+        try:
+            started = time.perf_counter()
+            self.driver = self.factory()
+            self.started_at = time.time()
+            logging.info(f"🔥 {self.name} browser ready in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            self._error = e
+            logging.error(f"❌ Could not start the {self.name} browser: {e}")
+        finally:
+            self._ready.set()
+
+    def healthy(self):
+        if self.driver is None:
+            return False
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def get(self):
+        """Returns a driver that has just answered a health check."""
+        self._ready.wait()
+        if not self.healthy():
+            self.recycle("health check failed")
+            self._ready.wait()
+        if self.driver is None:
+            raise WebDriverException(f"{self.name} browser is not available: {self._error}")
+        return self.driver
+
+    def recycle(self, reason):
+        logging.warning(f"♻️ Recycling the {self.name} browser ({reason})")
+        self.recycles += 1
+        self.quit()
+        self.start()
+
+    def quit(self):
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def describe(self):
+        if not self._ready.is_set():
+            return "starting"
+        if self.driver is None:
+            return f"down ({self._error})"
+        return f"up {time.time() - self.started_at:.0f}s, recycled {self.recycles}x"
+
+# ===============================
+# 🔹 OUTPUT STREAMING
+# ===============================
+
+class _ClientStream:
+    """File-like object that forwards print() output to the connected client."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.connected = True
+
+    def send(self, kind, text):
+        with self.lock:
+            if not self.connected:
+                return
+            try:
+                self.conn.send((kind, text))
+            except (OSError, EOFError):
+                # Client window closed: keep the stage running, stop streaming
+                self.connected = False
+
+    def write(self, text):
+        if text:
+            self.send("out", text)
+        return len(text)
+
+    def flush(self):
+        pass
+
+class _ClientLogHandler(logging.Handler):
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.stream.send("out", self.format(record) + "\n")
+
+# ===============================
+# 🔹 DAEMON
+# ===============================
+
+class BrowserDaemon:
+    def __init__(self, lean=False):
+        from First_Run import BROWSER_PREFS
+        from firefox_setup import LEAN_PREFS
+
+        self.lean = lean
+        self.profile_path = profile_path = get_firefox_profile()
+        # Logged-in browser on the real profile for login / logout / apply (BiDi for apply --tabs)
+        self.profile = WarmSession("profile", lambda: build_driver(profile_path=profile_path, bidi=True))
+        # Headless throwaway-profile browser for scraping
+        scrape_prefs = dict(BROWSER_PREFS, **(LEAN_PREFS if lean else {}))
+        self.scraper = WarmSession("scrape", lambda: build_driver(headless=True, prefs=scrape_prefs))
+        self.started_at = time.time()
+        self.running = True
+
+    def sessions(self):
+        return [self.profile, self.scraper]
+
+    # ---------- stages ----------
+
+    def run_login(self, argv):
+        from Login import login, session_still_valid
+        if "--force" not in argv and session_still_valid(self.profile_path):
+            return True
+        return login(self.profile.get())
+
+    def run_logout(self, argv):
+        from Logout import logout
+        return logout(self.profile.get())
+
+    def run_scrape(self, argv):
+        import First_Run
+        options = First_Run.parser.parse_args(argv)
+        driver = None
+        # Lean needs a lean browser; the warm one only is if the daemon was started with --lean
+        if options.engine == "browser" and (self.lean or not options.lean):
+            driver = self.scraper.get()
+        First_Run.main(argv, driver=driver)
+
+    def run_apply(self, argv):
+        import Second_Run
+        Second_Run.main(argv, driver=self.profile.get())
+
+    def run_status(self, argv):
+        lines = [f"Daemon pid {os.getpid()}, up {time.time() - self.started_at:.0f}s"]
+        lines += [f"  {session.name:8}: {session.describe()}" for session in self.sessions()]
+        return "\n".join(lines)
+
+    def run_shutdown(self, argv):
+        self.running = False
+        return "Browser daemon stopping"
+
+    STAGES = {"login": "profile", "logout": "profile", "apply": "profile", "scrape": "scraper"}
+
+    def handle(self, conn):
+        command, argv = conn.recv()
+        handler = getattr(self, f"run_{command}", None)
+        if handler is None:
+            conn.send(("error", f"Unknown command: {command}"))
+            return
+        if command not in self.STAGES:
+            conn.send(("done", handler(argv)))
+            return
+
+        stream = _ClientStream(conn)
+        log_handler = _ClientLogHandler(stream)
+        root = logging.getLogger()
+        root.addHandler(log_handler)
+        saved = sys.stdout, sys.stderr
+        sys.stdout = sys.stderr = stream
+        started = time.perf_counter()
+        try:
+            result = handler(argv)
+            outcome = ("done", result)
+        except SystemExit as e:
+            if isinstance(e.code, int) and e.code >= 128:
+                raise  # SIGTERM: stop the daemon itself
+            outcome = ("error", f"{command} exited ({e.code})")
+        except WebDriverException as e:
+            getattr(self, self.STAGES[command]).recycle(f"{command} failed: {e.msg}")
+            outcome = ("error", f"{command} failed: {e}")
+        except Exception as e:
+            logging.exception(f"{command} failed")
+            outcome = ("error", f"{command} failed: {e}")
+        finally:
+            sys.stdout, sys.stderr = saved
+            root.removeHandler(log_handler)
+        logging.info(f"⏱️ {command} finished in {time.perf_counter() - started:.1f}s")
+        stream.send(*outcome)
+
+    def serve(self):
+        authkey = secrets.token_bytes(32)
+        with Listener((HOST, 0), authkey=authkey) as listener:
+            port = listener.address[1]
+            for session in self.sessions():
+                session.start()
+            _write_daemon_file({"port": port, "authkey": authkey.hex(), "pid": os.getpid()})
+            logging.info(f"🟢 Browser daemon listening on {HOST}:{port}")
+            try:
+                # One command at a time: stages share the browsers and the result files
+                while self.running:
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        logging.warning(f"Rejected connection: {e}")
+                        continue
+                    with conn:
+                        try:
+                            self.handle(conn)
+                        except (OSError, EOFError):
+                            pass
+            finally:
+                _remove_daemon_file()
+                for session in self.sessions():
+                    session.quit()
+                logging.info("🔴 Browser daemon stopped")
+
+def _write_daemon_file(info):
+    tmp_path = DAEMON_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f)
+    os.replace(tmp_path, DAEMON_FILE)
+
+def _remove_daemon_file():
+    try:
+        os.remove(DAEMON_FILE)
+    except OSError:
+        pass
+
+# ===============================
+# 🔹 CLIENT
+# ===============================
+
+def connect():
+    """Connection to the running daemon, or None if there is none."""
+    try:
+        with open(DAEMON_FILE, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        return Client((HOST, info["port"]), authkey=bytes.fromhex(info["authkey"]))
+    except (OSError, ValueError, KeyError):
+        return None
+
+def spawn_daemon(lean=False):
+    """Starts the daemon detached from this console and waits until it accepts commands."""
+    command = [sys.executable, os.path.abspath(__file__), "serve"] + (["--lean"] if lean else [])
+    kwargs = {"start_new_session": True}
+    if os.name == "nt":
+        kwargs = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    log_file = open(DAEMON_LOG, 'a', encoding='utf-8')
+    subprocess.Popen(command, cwd=os.getcwd(), stdin=subprocess.DEVNULL, stdout=log_file,
+                     stderr=subprocess.STDOUT, close_fds=True, **kwargs)
+    log_file.close()
+
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        conn = connect()
+        if conn is not None:
+            return conn
+        time.sleep(0.2)
+    raise RuntimeError(f"Browser daemon did not start, see {DAEMON_LOG}")
+
+def send_command(command, argv=(), autostart=True, lean=False):
+    """Runs a command in the daemon, echoing its output here. Returns the result."""
+    conn = connect()
+    if conn is None:
+        if not autostart:
+            print("Browser daemon is not running.")
+            return None
+        print("Starting browser daemon...")
+        conn = spawn_daemon(lean=lean)
+
+    with conn:
+        conn.send((command, list(argv)))
+        while True:
+            kind, payload = conn.recv()
+            if kind == "out":
+                sys.stdout.write(payload)
+                sys.stdout.flush()
+            elif kind == "error":
+                print(f"❌ {payload}")
+                return None
+            else:
+                if isinstance(payload, str):
+                    print(payload)
+                return payload
+
+# Stage options naming a file; the daemon may run in another folder, so they are sent as full paths
+PATH_OPTIONS = ("--batch", "--csv")
+
+def _absolute_paths(argv):
+    argv = list(argv)
+    for i, arg in enumerate(argv[:-1]):
+        if arg in PATH_OPTIONS:
+            argv[i + 1] = os.path.abspath(argv[i + 1])
+    return argv
+
+def _prompt_scrape_args(argv):
+    # The daemon has no console, so the interactive questions are asked here
+    argv = list(argv)
+    if "--batch" in argv:
+        return argv
+    if "--url" not in argv:
+        argv += ["--url", input("Enter the job listing URL: ").strip()]
+    if "--target" not in argv:
+        argv += ["--target", input("Enter number of jobs you want to scrape: ").strip()]
+    return argv
+
+# ===============================
+# 🔹 COMMAND LINE
+# ===============================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep warm Firefox sessions between the login, scrape and apply stages")
+    parser.add_argument("command", choices=["serve", "start", "status", "stop",
+                                            "login", "logout", "scrape", "apply"])
+    parser.add_argument("--lean", action="store_true",
+                        help="serve / start: make the warm scraping browser a lean one")
+    args, stage_args = parser.parse_known_args()
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+        BrowserDaemon(lean=args.lean).serve()
+    elif args.command == "start":
+        send_command("status", lean=args.lean)
+    elif args.command == "status":
+        send_command("status", autostart=False)
+    elif args.command == "stop":
+        send_command("shutdown", autostart=False)
+    else:
+        if args.lean and args.command in ("scrape", "apply"):
+            stage_args.append("--lean")
+        if args.command == "scrape":
+            stage_args = _prompt_scrape_args(stage_args)
+        send_command(args.command, _absolute_paths(stage_args))
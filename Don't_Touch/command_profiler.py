@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from run_metrics import METRICS_FOLDER, percentile
+
+# ===============================
+# 🔹 WEBDRIVER COMMAND PROFILER
+# ===============================
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames that only pass a command through; the call site is the bot code above them
+PASS_THROUGH_FILES = {"firefox_setup.py", "command_profiler.py", "adaptive_wait.py"}
+TOP_CALL_SITES = 10
+
+# The running profiler, if any; instrumented drivers report to it (see firefox_setup.instrument_driver)
+active = None
+
+def _call_site():
+    frame = sys._getframe(3)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if os.path.dirname(os.path.abspath(path)) == SCRIPT_DIR and os.path.basename(path) not in PASS_THROUGH_FILES:
+            return f"{os.path.basename(path)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "(outside the bot)"
+
+class CommandProfiler:
+    """Times every WebDriver command and attributes it to the job or page it was sent for.
+
+    Commands collect per thread until RunMetrics.record() closes the job/page
+    they belong to (item_done); each one is then written as a JSON line with
+    its command name, latency, call site and item.
+    """
+
+    def __init__(self, kind, folder=METRICS_FOLDER):
+        os.makedirs(folder, exist_ok=True)
+        self.kind = kind
+        self.path = os.path.join(folder, f"commands_{kind}_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.jsonl")
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.started = time.monotonic()
+        self.latencies = defaultdict(list)      # command -> [ms]
+        self.sites = defaultdict(list)          # (call site, command) -> [ms]
+        self.per_item = {}                      # item -> commands
+
+    def _pending(self):
+        if not hasattr(self.local, "pending"):
+            self.local.pending = []
+        return self.local.pending
+
+    def record(self, command, seconds):
+        site = _call_site()
+        ms = seconds * 1000
+        self._pending().append((command, ms, site))
+        with self.lock:
+            self.latencies[command].append(ms)
+            self.sites[(site, command)].append(ms)
+
+    def item_done(self, item):
+        """The calling thread finished `item`: its commands since the last item belong to it."""
+        pending = self._pending()
+        if not pending:
+            return
+        self.local.pending = []
+        with self.lock:
+            self.per_item[item] = self.per_item.get(item, 0) + len(pending)
+            for command, ms, site in pending:
+                self.file.write(json.dumps({"item": item, "command": command,
+                                            "ms": round(ms, 1), "site": site}) + "\n")
+
+    def summary(self, unit="jobs"):
+        """Logs commands per job/page, time per command and the slowest call sites; closes the file."""
+        self.item_done("(between items)")
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.close()
+            elapsed = time.monotonic() - self.started
+            total = sum(len(values) for values in self.latencies.values())
+            wire_s = sum(sum(values) for values in self.latencies.values()) / 1000
+            items = [item for item in self.per_item if item != "(between items)"]
+            per_item = total / len(items) if items else 0.0
+
+            logging.info(f"🔬 WebDriver commands → {total} commands for {len(items)} {unit} "
+                         f"({per_item:.1f} per {unit.rstrip('s')}), {wire_s:.1f}s waiting on the driver "
+                         f"({100 * wire_s / (elapsed or 1):.0f}% of the run), details in {self.path}")
+            logging.info("  by command (total time):")
+            for command, values in sorted(self.latencies.items(), key=lambda entry: -sum(entry[1])):
+                ordered = sorted(values)
+                logging.info(f"    {command:28} {len(values):6}x  total {sum(values) / 1000:7.1f}s  "
+                             f"mean {sum(values) / len(values):6.0f} ms  p95 {percentile(ordered, 95):6.0f} ms")
+            logging.info(f"  slowest call sites (top {TOP_CALL_SITES} by total time):")
+            slowest = sorted(self.sites.items(), key=lambda entry: -sum(entry[1]))[:TOP_CALL_SITES]
+            for (site, command), values in slowest:
+                logging.info(f"    {site:45} {command:22} {len(values):6}x  total {sum(values) / 1000:7.1f}s  "
+                             f"mean {sum(values) / len(values):6.0f} ms")
+
+def start(kind):
+    """Starts profiling the commands of every instrumented driver in this process."""
+    global active
+    active = CommandProfiler(kind)
+    logging.info("🔬 Profiling WebDriver commands")
+    return active
+
+def stop(unit="jobs"):
+    global active
+    profiler, active = active, None
+    if profiler is not None:
+        profiler.summary(unit)
+
+def item_done(item):
+    profiler = active
+    if profiler is not None:
+        profiler.item_done(item)
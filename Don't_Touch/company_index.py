@@ -0,0 +1,67 @@
+import re
+import unicodedata
+
+# ===============================
+# 🔹 COMPANY NAME NORMALIZATION
+# ===============================
+
+# Trailing words that only state the legal form ("ABC Pvt Ltd" == "ABC Private Limited" == "abc")
+LEGAL_SUFFIXES = [
+    "and co", "and company", "private limited", "pvt limited", "private ltd", "pvt ltd", "pte ltd", "pty ltd",
+    "limited", "ltd", "pvt", "private", "llp", "llc", "plc", "inc", "incorporated",
+    "corp", "corporation", "co", "company", "gmbh", "ag", "sa", "bv", "opc",
+]
+_SUFFIX_TOKENS = sorted((suffix.split() for suffix in LEGAL_SUFFIXES), key=len, reverse=True)
+
+NO_COMPANY = {"", "not available", "na", "n a"}
+
+def company_key(name):
+    """Normalized company key: case, accents, punctuation and legal suffixes folded away.
+
+    Returns "" for a missing name, which never matches anything.
+    """
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace("&", " and ")
+    # "Pvt. Ltd." -> "pvt ltd", "(OPC)" -> "opc"
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    if " ".join(tokens) in NO_COMPANY:
+        return ""
+
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _SUFFIX_TOKENS:
+            if len(tokens) > len(suffix) and tokens[-len(suffix):] == suffix:
+                tokens = tokens[:-len(suffix)]
+                stripped = True
+                break
+    # "Tech Mahindra" == "TechMahindra"
+    return "".join(tokens)
+
+# ===============================
+# 🔹 COMPANY INDEX
+# ===============================
+
+class CompanyIndex:
+    """Set of company keys, looked up by raw company name."""
+
+    def __init__(self, keys=()):
+        self.keys = {key for key in keys if key}
+
+    def __contains__(self, name):
+        key = company_key(name)
+        return bool(key) and key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, name):
+        """Returns True when the company was not in the index yet."""
+        key = company_key(name)
+        if not key or key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
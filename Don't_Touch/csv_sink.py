@@ -0,0 +1,152 @@
+import os
+import csv
+import sys
+import time
+import queue
+import atexit
+import signal
+import logging
+import threading
+from collections import defaultdict
+
+# ===============================
+# 🔹 DURABILITY POLICIES
+# ===============================
+
+# none  = rows reach the OS when Python's file buffer fills or the sink closes
+# flush = every batch is flushed to the OS (survives a crash of the script)
+# fsync = every batch is flushed and fsync'ed (survives a power cut)
+DURABILITY_CHOICES = ("none", "flush", "fsync")
+
+_FLUSH = object()
+
+# ===============================
+# 🔹 BATCHED CSV WRITER
+# ===============================
+
+class CsvSink:
+    """One background thread that owns every result CSV a run appends to.
+
+    Rows are buffered per destination and written when a destination reaches
+    `batch_size` rows or `flush_interval` seconds have passed. File handles stay
+    open for the whole run; close() drains everything that was queued.
+    """
+
+    def __init__(self, batch_size=50, flush_interval=2.0, durability="flush"):
+        if durability not in DURABILITY_CHOICES:
+            raise ValueError(f"Unknown durability policy: {durability}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.queue = queue.Queue()
+        self.handles = {}
+        self.writers = {}
+        self.buffers = defaultdict(list)
+        self.rows_written = defaultdict(int)
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="csv-sink", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def register(self, file_path, headers):
+        """Opens file_path for appending, writing headers if the file is new or empty."""
+        done = threading.Event()
+        self.queue.put(("open", file_path, headers, done))
+        done.wait()
+
+    def put(self, file_path, row):
+        self.queue.put(("row", file_path, list(row), None))
+
+    def put_many(self, file_path, rows):
+        for row in rows:
+            self.put(file_path, row)
+
+    def flush(self):
+        """Blocks until every row queued so far has been written out."""
+        done = threading.Event()
+        self.queue.put((_FLUSH, None, None, done))
+        done.wait()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        # The browser daemon runs many stages in one process: do not keep one exit hook per run
+        atexit.unregister(self.close)
+        self.queue.put(None)
+        self.thread.join()
+
+    # ---------- writer thread ----------
+
+    def _open(self, file_path, headers):
+        if file_path in self.handles:
+            return
+        needs_header = not os.path.exists(file_path) or os.stat(file_path).st_size == 0
+        handle = open(file_path, 'a', newline='', encoding='utf-8')
+        self.handles[file_path] = handle
+        self.writers[file_path] = csv.writer(handle)
+        if needs_header and headers:
+            self.writers[file_path].writerow(headers)
+            self._sync(handle)
+
+    def _sync(self, handle):
+        if self.durability in ("flush", "fsync"):
+            handle.flush()
+        if self.durability == "fsync":
+            os.fsync(handle.fileno())
+
+    def _write(self, file_path):
+        rows = self.buffers.pop(file_path, None)
+        if not rows:
+            return
+        if file_path not in self.handles:
+            self._open(file_path, None)
+        self.writers[file_path].writerows(rows)
+        self._sync(self.handles[file_path])
+        self.rows_written[file_path] += len(rows)
+
+    def _write_all(self):
+        for file_path in list(self.buffers):
+            self._write(file_path)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _FLUSH, None, None, None
+
+            if item is None:
+                break
+            kind, file_path, payload, done = item
+            try:
+                if kind == "open":
+                    self._open(file_path, payload)
+                elif kind == "row":
+                    self.buffers[file_path].append(payload)
+                    if len(self.buffers[file_path]) >= self.batch_size:
+                        self._write(file_path)
+                if kind is _FLUSH or time.monotonic() - last_flush >= self.flush_interval:
+                    self._write_all()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                logging.error(f"CSV writer error ({file_path}): {e}")
+            finally:
+                if done is not None:
+                    done.set()
+
+        self._write_all()
+        for handle in self.handles.values():
+            handle.flush()
+            if self.durability == "fsync":
+                os.fsync(handle.fileno())
+            handle.close()
+        self.handles.clear()
+
+def exit_on_sigterm():
+    """Turns SIGTERM into SystemExit so `finally` blocks (and the sink) drain on kill."""
+    def handler(signum, frame):
+        sys.exit(128 + signum)
+    signal.signal(signal.SIGTERM, handler)
@@ -0,0 +1,155 @@
+import time
+import logging
+from collections import deque
+from statistics import median
+from selenium.common.exceptions import TimeoutException
+
+try:
+    import psutil
+except ImportError:  # optional: without it browsers are not recycled on memory
+    psutil = None
+
+# ===============================
+# 🔹 BROWSER HEALTH LIMITS
+# ===============================
+
+RSS_CHECK_EVERY = 10        # jobs between memory checks (walking the process tree is not free)
+LOAD_SAMPLES = 20           # page loads in the fresh-browser baseline and in the recent window
+START_ATTEMPTS = 3          # tries to bring up a replacement browser before the worker gives up
+START_RETRY_DELAY = 5       # seconds between those tries
+
+class BrowserUnavailable(Exception):
+    """No working browser could be started in place of the old one."""
+
+def browser_rss_mb(driver):
+    """Resident memory of geckodriver and every Firefox process under it, in MB (None without psutil)."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if psutil is None or process is None:
+        return None
+    try:
+        root = psutil.Process(process.pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    rss = 0
+    for child in processes:
+        try:
+            rss += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return rss / 1024 / 1024
+
+# ===============================
+# 🔹 DRIVER SUPERVISOR
+# ===============================
+
+class DriverSupervisor:
+    """Owns one worker's browser: recycles it before it gets slow and replaces it when it dies.
+
+    `start` builds a ready driver. Between jobs, job_done() restarts the browser
+    after `recycle_every` jobs, above `max_rss_mb`, or once its recent page loads
+    are `max_slowdown` times slower than its first ones (0 turns a limit off).
+    After a job raised, crashed() tells a lost browser from a failing page and
+    replaces the browser in the first case. A borrowed driver (the browser
+    daemon's) is never quit or recycled here, since the daemon owns it and a
+    second Firefox cannot open the same profile; it is only replaced once it
+    has died, and that replacement is ours to quit at the end.
+    """
+
+    def __init__(self, start, driver=None, recycle_every=0, max_rss_mb=0, max_slowdown=0):
+        self.start_driver = start
+        self.driver = driver
+        self.owned = driver is None
+        self.recycle_every = recycle_every
+        self.max_rss_mb = max_rss_mb
+        self.max_slowdown = max_slowdown
+        self.restarts = 0
+        self._reset()
+        if not self.owned and (recycle_every or max_rss_mb or max_slowdown):
+            logging.info("Using the browser daemon's Firefox: it is not recycled, only replaced if it dies")
+
+    def _reset(self):
+        self.jobs = 0
+        self.baseline = []
+        self.recent = deque(maxlen=LOAD_SAMPLES)
+
+    def start(self):
+        if self.driver is None:
+            self.driver = self.start_driver()
+        return self.driver
+
+    def alive(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def crashed(self, error):
+        """Called after a job raised `error`. True when the browser was lost (it is replaced by then)."""
+        if isinstance(error, TimeoutException) or self.alive():
+            return False
+        self.replace(f"browser lost: {str(error).strip()}")
+        return True
+
+    def job_done(self, timer):
+        """Counts a finished job and recycles the browser if it grew too big or too slow."""
+        self.jobs += 1
+        load_ms = timer.phases.get("navigate")
+        if load_ms is not None:
+            if len(self.baseline) < LOAD_SAMPLES:
+                self.baseline.append(load_ms)
+            else:
+                self.recent.append(load_ms)
+        reason = self._recycle_reason()
+        if reason:
+            self.replace(reason)
+
+    def _recycle_reason(self):
+        if not self.owned:
+            return None
+        if self.recycle_every and self.jobs >= self.recycle_every:
+            return f"{self.jobs} jobs done"
+        if self.max_rss_mb and self.jobs % RSS_CHECK_EVERY == 0:
+            rss = browser_rss_mb(self.driver)
+            if rss is not None and rss > self.max_rss_mb:
+                return f"using {rss:.0f} MB"
+        if self.max_slowdown and len(self.recent) == LOAD_SAMPLES:
+            fresh, now = median(self.baseline), median(self.recent)
+            if fresh and now > fresh * self.max_slowdown:
+                return f"pages load in {now:.0f} ms, {fresh:.0f} ms when it was fresh"
+        return None
+
+    def replace(self, reason):
+        """Quits the browser and starts a new one; BrowserUnavailable if none will start."""
+        logging.warning(f"♻️ Restarting Firefox ({reason})")
+        if self.owned:
+            self._quit()
+        else:
+            self.driver = None  # the daemon notices its browser died and rebuilds it
+        self.owned = True
+        self.restarts += 1
+        self._reset()
+        started = time.perf_counter()
+        for attempt in range(1, START_ATTEMPTS + 1):
+            try:
+                self.driver = self.start_driver()
+                break
+            except Exception as e:
+                logging.error(f"❌ Firefox did not start (try {attempt}/{START_ATTEMPTS}): {e}")
+                if attempt == START_ATTEMPTS:
+                    raise BrowserUnavailable(f"Firefox did not start after {reason}: {e}") from e
+                time.sleep(START_RETRY_DELAY)
+        logging.info(f"♻️ Firefox restarted in {time.perf_counter() - started:.1f}s")
+
+    def _quit(self):
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass  # already gone
+
+    def quit(self):
+        """End of the run: quits the browser unless it is borrowed from the daemon."""
+        if self.owned:
+            self._quit()
@@ -0,0 +1,199 @@
+import re
+import time
+import random
+import logging
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+# ===============================
+# 🔹 STAND-IN SITE LAYOUT
+# ===============================
+
+# Search result pages: /<anything>-jobs, /<anything>-jobs-2, ... (same scheme as Naukri)
+LISTING_PATH = re.compile(r"^/(?P<slug>[a-z0-9-]+?-jobs)(?:-(?P<page>\d+))?/?$")
+# Job pages end in the numeric job ID, like the real job-listings URLs
+JOB_PATH = re.compile(r"^/job-listings-[a-z0-9-]+-(?P<job_id>\d{6,})/?$")
+
+FIRST_JOB_ID = 200000000
+PAGE_SIZE = 20
+COMPANY_COUNT = 40
+
+# Share of job pages in each state Second_Run.py recognises; "manual" pages
+# show no marker at all, so the classifier runs into its timeout on them
+DEFAULT_MIX = {"apply": 60, "expired": 10, "already_applied": 10, "company_site": 15, "manual": 5}
+
+LISTING_TUPLE = """<div class="srp-jobtuple-wrapper"><div>
+<a class="title" href="/job-listings-{slug}-{job_id}">{title}</a>
+<a class=" comp-name mw-25">{company}</a><span class="expwdth">{experience}</span><span class="locWdth">{location}</span>
+</div></div>"""
+
+NEXT_LINK = """<a class="styles_btn-secondary__2AsIP" href="{href}"><span>Next</span></a>"""
+
+# Markers are added by script after `render` ms, the way the real single-page app renders them;
+# with `ssr` the server already puts them into the HTML (what Triage.py can see without a browser)
+JOB_PAGE = """<html><head><title>{title}</title></head><body><div id="root">{prerendered}</div>
+<script>
+var state = "{state}";
+function render() {{
+    var root = document.getElementById("root");
+    root.innerHTML = "<h1>{title}</h1>";
+    if (state === "expired") {{
+        root.innerHTML += '<div class="styles_alert-message-text__QwDRi">This job has expired</div>';
+    }} else if (state === "already_applied") {{
+        root.innerHTML += '<span id="already-applied">Applied</span>';
+    }} else if (state === "company_site") {{
+        root.innerHTML += '<button id="company-site-button">Apply on company site</button>';
+    }} else if (state === "apply") {{
+        var button = document.createElement("button");
+        button.textContent = "Apply";
+        button.onclick = function () {{
+            fetch("/apply/{job_id}", {{method: "POST"}}).then(function () {{
+                var done = document.createElement("div");
+                done.className = {done_class};
+                done.textContent = "You have successfully applied";
+                root.appendChild(done);
+            }});
+        }};
+        root.appendChild(button);
+    }}
+}}
+setTimeout(render, {render});
+</script></body></html>"""
+
+SSR_MARKUP = {
+    "expired": '<div class="styles_alert-message-text__QwDRi">This job has expired</div>',
+    "already_applied": '<span id="already-applied">Applied</span>',
+    "company_site": '<button id="company-site-button">Apply on company site</button>',
+    "apply": '<button>Apply</button>',
+}
+
+def pick_state(job_id, mix):
+    """Deterministic state for a job ID, so every run sees the same site."""
+    roll = random.Random(job_id).uniform(0, sum(mix.values()))
+    for state, weight in mix.items():
+        roll -= weight
+        if roll < 0:
+            return state
+    return "apply"
+
+# ===============================
+# 🔹 SERVER
+# ===============================
+
+class FakeNaukri(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, pages=10, latency_ms=0, jitter_ms=0, render_ms=50, mix=None, ssr=False):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.pages = pages
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.render_ms = render_ms
+        self.mix = mix or DEFAULT_MIX
+        self.ssr = ssr
+        self.applied = set()
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="fake-naukri", daemon=True).start()
+        return self
+
+    def delay(self):
+        with self.lock:
+            self.requests += 1
+        ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    def listing_page(self, slug, page):
+        if page > self.pages:
+            return None
+        tuples = []
+        for i in range(PAGE_SIZE):
+            job_id = FIRST_JOB_ID + (page - 1) * PAGE_SIZE + i
+            tuples.append(LISTING_TUPLE.format(
+                slug=slug.replace("-jobs", ""), job_id=job_id, title=f"Developer {job_id}",
+                company=f"Company {job_id % COMPANY_COUNT}", experience=f"{job_id % 5}-{job_id % 5 + 3} Yrs",
+                location=("Pune", "Bengaluru", "Remote")[job_id % 3],
+            ))
+        if page < self.pages:
+            tuples.append(NEXT_LINK.format(href=f"/{slug}-{page + 1}"))
+        return "<html><body>" + "".join(tuples) + "</body></html>"
+
+    def job_page(self, job_id):
+        with self.lock:
+            state = "already_applied" if job_id in self.applied else pick_state(job_id, self.mix)
+        done_class = '"applied-job-content"' if job_id % 2 else '"apply-message"'
+        prerendered = SSR_MARKUP.get(state, "") if self.ssr else "Loading..."
+        return JOB_PAGE.format(title=f"Developer {job_id}", state=state, job_id=job_id,
+                               done_class=done_class, render=self.render_ms, prerendered=prerendered)
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=""):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.delay()
+        path = urlsplit(self.path).path
+        listing = LISTING_PATH.match(path)
+        if listing:
+            body = self.server.listing_page(listing.group("slug"), int(listing.group("page") or 1))
+            return self._send(200, body) if body else self._send(404, "No more jobs")
+        job = JOB_PATH.match(path)
+        if job:
+            return self._send(200, self.server.job_page(int(job.group("job_id"))))
+        self._send(404, "Not found")
+
+    def do_POST(self):
+        self.server.delay()
+        match = re.match(r"^/apply/(\d+)$", urlsplit(self.path).path)
+        if not match:
+            return self._send(404, "Not found")
+        with self.server.lock:
+            self.server.applied.add(int(match.group(1)))
+        self._send(200, "ok")
+
+def parse_mix(text):
+    """"apply=60,expired=10,..." -> dict (states left out get weight 0)."""
+    mix = {state: 0 for state in DEFAULT_MIX}
+    for part in text.split(","):
+        state, _, weight = part.partition("=")
+        if state.strip() not in mix:
+            raise argparse.ArgumentTypeError(f"unknown state {state!r}, expected one of {', '.join(mix)}")
+        mix[state.strip()] = float(weight)
+    return mix
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Local stand-in for Naukri search results and job pages")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=10, help=f"result pages per search ({PAGE_SIZE} jobs each)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random delay, 0..jitter")
+    parser.add_argument("--render-ms", type=int, default=50, help="delay before job page markers appear")
+    parser.add_argument("--mix", type=parse_mix, help="job states, e.g. apply=60,expired=10,company_site=30")
+    parser.add_argument("--ssr", action="store_true", help="put the job page markers into the HTML as well")
+    args = parser.parse_args()
+
+    server = FakeNaukri(args.port, args.pages, args.latency_ms, args.jitter_ms, args.render_ms, args.mix, args.ssr)
+    logging.info(f"🧪 Stand-in Naukri at {server.base_url}/python-jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
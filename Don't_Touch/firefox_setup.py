@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import atexit
+import threading
+from collections import Counter
+from concurrent.futures import Future
+import shutil
+import logging
+import argparse
+import tempfile
+import configparser
+from urllib.parse import quote
+from selenium import webdriver
+from selenium.webdriver.firefox.service import Service
+from selenium.webdriver.firefox.options import Options
+import command_profiler
+
+# ===============================
+# 🔹 PATHS
+# ===============================
+
+GECKODRIVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "geckodriver.exe")
+
+def get_firefox_profile():
+    profile_ini_path = os.path.expanduser("~/.mozilla/firefox/profiles.ini")  # Linux/macOS
+    if os.name == "nt":  # Windows
+        profile_ini_path = os.path.join(os.getenv("APPDATA"), "Mozilla", "Firefox", "profiles.ini")
+
+    config = configparser.ConfigParser()
+    if os.path.exists(profile_ini_path):
+        config.read(profile_ini_path)
+        for section in config.sections():
+            if config.has_option(section, "Default") and config.get(section, "Default") == "1":
+                profile_path = config.get(section, "Path")
+                return os.path.join(os.path.dirname(profile_ini_path), profile_path)
+
+    raise Exception("No default Firefox profile found!")
+
+def get_firefox_binary():
+    firefox_path = shutil.which("firefox")
+    if firefox_path:
+        return firefox_path
+    else:
+        possible_paths = [
+            "C:\\Program Files\\Mozilla Firefox\\firefox.exe",
+            "C:\\Program Files (x86)\\Mozilla Firefox\\firefox.exe"
+        ]
+        for path in possible_paths:
+            if os.path.exists(path):
+                return path
+        raise Exception("Firefox binary not found! Please check your installation.")
+
+# ===============================
+# 🔹 LEAN MODE
+# ===============================
+
+# Third-party ad / analytics / video hosts the bots never need. Requests to them
+# are sent to a closed local port by a PAC script, so they fail immediately.
+BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "facebook.net", "facebook.com", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "bat.bing.com", "scorecardresearch.com",
+    "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "amazon-adsystem.com",
+    "moengage.com", "webengage.com", "nr-data.net", "newrelic.com",
+    "ads-twitter.com", "analytics.twitter.com", "snap.licdn.com",
+    "youtube.com", "ytimg.com", "vimeo.com",
+]
+
+PAC_TEMPLATE = """function FindProxyForURL(url, host) {
+    var blocked = %s;
+    for (var i = 0; i < blocked.length; i++) {
+        if (host === blocked[i] || dnsDomainIs(host, "." + blocked[i])) {
+            return "PROXY 127.0.0.1:9";
+        }
+    }
+    return "DIRECT";
+}"""
+
+def blocking_pac_url(hosts=BLOCKED_HOSTS):
+    return "data:application/x-ns-proxy-autoconfig," + quote(PAC_TEMPLATE % json.dumps(hosts))
+
+LEAN_PREFS = {
+    # no images, web fonts or media
+    "permissions.default.image": 2,
+    "gfx.downloadable_fonts.enabled": False,
+    "browser.display.use_document_fonts": 0,
+    "media.autoplay.default": 5,
+    "media.autoplay.blocking_policy": 2,
+    "media.mediasource.enabled": False,
+    "media.hls.enabled": False,
+    # built-in tracker / ad lists
+    "privacy.trackingprotection.enabled": True,
+    "privacy.trackingprotection.socialtracking.enabled": True,
+    "privacy.trackingprotection.cryptomining.enabled": True,
+    "privacy.trackingprotection.fingerprinting.enabled": True,
+    # nothing fetched speculatively
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+    # everything else on BLOCKED_HOSTS
+    "network.proxy.type": 2,
+    "network.proxy.autoconfig_url": blocking_pac_url(),
+}
+
+# ===============================
+# 🔹 PROFILE CLONES
+# ===============================
+
+# Lock files and caches that must not be copied into a profile clone
+PROFILE_CLONE_IGNORE = shutil.ignore_patterns(
+    "parent.lock", "lock", ".parentlock",
+    "cache2", "startupCache", "thumbnails", "crashes", "minidumps",
+    "datareporting", "saved-telemetry-pings", "sessionstore-backups",
+)
+
+def write_user_prefs(profile_path, prefs):
+    with open(os.path.join(profile_path, "user.js"), 'a', encoding='utf-8') as f:
+        for name, value in prefs.items():
+            f.write(f"user_pref({json.dumps(name)}, {json.dumps(value)});\n")
+
+def clone_firefox_profile(profile_path, name, prefs=None):
+    """Copies the logged-in profile to a temp folder, optionally baking extra prefs into it.
+
+    Used for parallel workers and for lean mode, so the real profile never
+    picks up the lean prefs. Remove with remove_profile_clone().
+    """
+    clone_root = tempfile.mkdtemp(prefix=f"naukri_{name}_")
+    clone_path = os.path.join(clone_root, "profile")
+    shutil.copytree(profile_path, clone_path, ignore=PROFILE_CLONE_IGNORE)
+    if prefs:
+        write_user_prefs(clone_path, prefs)
+    return clone_path
+
+def remove_profile_clone(clone_path):
+    shutil.rmtree(os.path.dirname(clone_path), ignore_errors=True)
+
+# ===============================
+# 🔹 DRIVER CONSTRUCTION
+# ===============================
+
+def build_driver(profile_path=None, headless=False, lean=False, prefs=None, bidi=False):
+    """Starts Firefox through geckodriver.
+
+    profile_path runs Firefox on that profile (pass a clone from
+    clone_firefox_profile(..., prefs=LEAN_PREFS) for lean mode); without it
+    geckodriver uses a fresh temporary profile and lean/prefs are applied there.
+    bidi also opens a WebDriver BiDi socket for the session (see bidi_tabs.py).
+    """
+    options = Options()
+    options.binary_location = get_firefox_binary()
+    if headless:
+        options.add_argument("--headless")
+    if profile_path:
+        options.add_argument("-profile")
+        options.add_argument(profile_path)
+    if bidi:
+        options.set_capability("webSocketUrl", True)
+
+    all_prefs = dict(LEAN_PREFS) if lean else {}
+    all_prefs.update(prefs or {})
+    for name, value in all_prefs.items():
+        options.set_preference(name, value)
+
+    driver = webdriver.Firefox(service=Service(GECKODRIVER_PATH), options=options)
+    instrument_driver(driver)
+    return driver
+
+def build_driver_in_background(**options):
+    """Starts build_driver(**options) on its own thread, so Firefox boots while the caller
+    keeps working. Returns a concurrent.futures.Future of the driver."""
+    future = Future()
+
+    def build():
+        started = time.monotonic()
+        try:
+            future.set_result(build_driver(**options))
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            logging.info(f"🚀 Firefox ready in {time.monotonic() - started:.1f}s")
+
+    threading.Thread(target=build, name="browser-start", daemon=True).start()
+    return future
+
+def discard_driver(future):
+    """Quits a background-started driver nobody picked up (waits for it to finish starting)."""
+    try:
+        future.result().quit()
+    except Exception:
+        pass
+
+# ===============================
+# 🔹 WEBDRIVER COMMAND COUNTER / PROFILER HOOK
+# ===============================
+
+# Set to a file path to count every WebDriver command this process sends; the
+# totals are written there as JSON on exit (used by benchmark.py)
+COMMAND_COUNTS_ENV = "NAUKRI_COMMAND_COUNTS"
+
+command_counts = Counter()
+_command_lock = threading.Lock()
+_counts_registered = []
+
+def _write_command_counts():
+    with open(os.environ[COMMAND_COUNTS_ENV], 'w', encoding='utf-8') as f:
+        json.dump(dict(command_counts), f)
+
+def instrument_driver(driver):
+    """Wraps the driver's command executor (once): counts commands when COMMAND_COUNTS_ENV
+    is set, and times them for command_profiler while a profiler is running."""
+    executor = driver.command_executor
+    if getattr(executor, "instrumented", False):
+        return
+    execute = executor.execute
+    counting = bool(os.environ.get(COMMAND_COUNTS_ENV))
+
+    def instrumented_execute(command, params):
+        if counting:
+            with _command_lock:
+                command_counts[command] += 1
+        profiler = command_profiler.active
+        if profiler is None:
+            return execute(command, params)
+        started = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            profiler.record(command, time.perf_counter() - started)
+
+    executor.execute = instrumented_execute
+    executor.instrumented = True
+    if counting and not _counts_registered:
+        _counts_registered.append(True)
+        atexit.register(_write_command_counts)
+
+# ===============================
+# 🔹 PAGE WEIGHT REPORTING
+# ===============================
+
+# transferSize is 0 for cross-origin resources without Timing-Allow-Origin,
+# so the byte count is a lower bound; it is the same bound in both modes.
+PAGE_WEIGHT_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+resources.forEach(function (r) { bytes += r.transferSize || 0; });
+return {
+    bytes: bytes,
+    resources: resources.length,
+    load_ms: nav ? nav.loadEventEnd - nav.startTime : null
+};
+"""
+
+def page_weight(driver):
+    """Bytes transferred, resource count and load time of the page currently loaded."""
+    return driver.execute_script(PAGE_WEIGHT_JS)
+
+def compare_lean(urls, headless=True):
+    """Loads every URL in a normal and a lean browser and logs the difference."""
+    totals = {}
+    for lean in (False, True):
+        mode = "lean" if lean else "normal"
+        driver = build_driver(headless=headless, lean=lean)
+        try:
+            bytes_total, load_total, wall_total = 0, 0.0, 0.0
+            for url in urls:
+                started = time.perf_counter()
+                driver.get(url)
+                wall = time.perf_counter() - started
+                weight = page_weight(driver)
+                bytes_total += weight["bytes"]
+                load_total += weight["load_ms"] or 0
+                wall_total += wall
+                logging.info(f"[{mode}] {url}: {weight['bytes'] / 1024:.0f} KB, "
+                             f"{weight['resources']} resources, load {weight['load_ms'] or 0:.0f} ms")
+            totals[mode] = (bytes_total / len(urls), load_total / len(urls), wall_total / len(urls))
+        finally:
+            driver.quit()
+
+    logging.info("📊 Average per page →")
+    for mode, (avg_bytes, avg_load, avg_wall) in totals.items():
+        logging.info(f"  {mode:6}: {avg_bytes / 1024:.0f} KB, load {avg_load:.0f} ms, driver.get {avg_wall * 1000:.0f} ms")
+    normal, lean = totals["normal"], totals["lean"]
+    if normal[0] and normal[1]:
+        logging.info(f"  saved : {100 * (1 - lean[0] / normal[0]):.0f}% bytes, "
+                     f"{100 * (1 - lean[1] / normal[1]):.0f}% load time")
+    return totals
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Compare page weight with and without lean mode")
+    parser.add_argument("urls", nargs="+", help="pages to load (e.g. a search URL and a job URL)")
+    parser.add_argument("--show", action="store_true", help="show the browser windows")
+    args = parser.parse_args()
+    compare_lean(args.urls, headless=not args.show)
@@ -0,0 +1,147 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+from search_results import page_number, page_url, same_page
+from run_metrics import PhaseTimer
+from rate_scheduler import RateScheduler, THROTTLE_STATUSES, response_throttle_reason
+
+# ===============================
+# 🔹 HTTP SESSION
+# ===============================
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+REQUEST_TIMEOUT = 20
+THROTTLE_RETRIES = 2
+
+def make_session(pool_size=8):
+    """Keep-alive session whose connection pool is large enough for every page in flight."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    # 429 / 503 are left to the rate scheduler, which slows every fetch down instead
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# ===============================
+# 🔹 RESULT PAGE PARSING
+# ===============================
+
+# Same selectors First_Run.py uses in the browser
+TITLE_XPATH = "//div[contains(@class, 'srp-jobtuple-wrapper')]//a[contains(concat(' ', normalize-space(@class), ' '), ' title ')]"
+WRAPPER_XPATH = "./ancestor::div[contains(@class, 'srp-jobtuple-wrapper')][1]"
+COMPANY_XPATH = ".//a[contains(@class, 'comp-name')]"
+LOCATION_XPATH = ".//span[contains(@class, 'locWdth')]"
+EXPERIENCE_XPATH = ".//span[contains(@class, 'expwdth')]"
+NEXT_XPATH = "//a[contains(@class, 'styles_btn-secondary__2AsIP') and span[contains(text(), 'Next')]]/@href"
+
+def _text(element):
+    return " ".join(element.text_content().split())
+
+def _first_text(root, xpath):
+    found = root.xpath(xpath)
+    return _text(found[0]) if found else None
+
+def parse_job_tuples(page_html, page_url):
+    """Returns (records, next_link) shaped like search_results.extract_results_page."""
+    tree = lxml_html.fromstring(page_html)
+    tree.make_links_absolute(page_url)
+
+    records = []
+    for link in tree.xpath(TITLE_XPATH):
+        wrapper = link.xpath(WRAPPER_XPATH)[0]
+        records.append({
+            "title": _text(link),
+            "link": link.get("href"),
+            "company": _first_text(wrapper, COMPANY_XPATH),
+            "location": _first_text(wrapper, LOCATION_XPATH),
+            "experience": _first_text(wrapper, EXPERIENCE_XPATH),
+        })
+
+    next_links = tree.xpath(NEXT_XPATH)
+    return records, (next_links[0] if next_links else None)
+
+def fetch_page(session, url, scheduler):
+    """Returns (records, next_link, timer) with the page's "pace", "fetch" and "parse" times.
+
+    A throttle response (429/503, captcha page) slows the scheduler down and is
+    fetched again after its cool-down.
+    """
+    timer = PhaseTimer()
+    for attempt in range(THROTTLE_RETRIES + 1):
+        with timer.phase("pace"):
+            scheduler.acquire()
+        started = time.perf_counter()
+        with timer.phase("fetch"):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+        latency = time.perf_counter() - started
+        if response.status_code == 404:
+            return [], None, timer
+        if response.status_code not in THROTTLE_STATUSES:
+            response.raise_for_status()
+            with timer.phase("parse"):
+                records, next_link = parse_job_tuples(response.text, response.url)
+            if records:
+                scheduler.on_success(latency)
+                return records, next_link, timer
+        # No tuples: an empty last page, or a throttle / captcha page
+        reason = response_throttle_reason(response)
+        if not reason:
+            return [], None, timer
+        scheduler.on_throttle(reason)
+    return [], None, timer
+
+# ===============================
+# 🔹 PAGINATION
+# ===============================
+
+def iter_result_pages(session, url, concurrency=4, scheduler=None):
+    """Yields (page_url, records, timer) in page order until the results run out.
+
+    Once page 1 confirms the numbering scheme, `concurrency` pages are fetched
+    ahead in parallel, still no faster than the rate scheduler allows. Closing
+    the generator cancels the pages still queued.
+    """
+    scheduler = scheduler or RateScheduler(name="result page")
+    records, next_link, timer = fetch_page(session, url, scheduler)
+    yield url, records, timer
+    if not records or not next_link:
+        return
+
+    start = page_number(url)
+    if not same_page(next_link, page_url(url, start + 1)):
+        # Unknown numbering scheme: follow the Next links one by one
+        while next_link:
+            current = next_link
+            records, next_link, timer = fetch_page(session, current, scheduler)
+            yield current, records, timer
+            if not records:
+                return
+        return
+
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="page-fetch")
+    pending = deque()
+    page = start + 1
+    try:
+        while True:
+            while len(pending) < concurrency:
+                target = page_url(url, page)
+                pending.append((target, pool.submit(fetch_page, session, target, scheduler)))
+                page += 1
+            current, future = pending.popleft()
+            records, next_link, timer = future.result()
+            yield current, records, timer
+            if not records or not next_link:
+                return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
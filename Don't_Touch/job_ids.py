@@ -0,0 +1,82 @@
+import re
+from heapq import merge
+from array import array
+from bisect import bisect_left
+from urllib.parse import urlsplit, parse_qsl
+
+# ===============================
+# 🔹 CANONICAL JOB KEYS
+# ===============================
+
+# Naukri detail URLs end in the posting's numeric ID
+# (.../job-listings-python-developer-acme-pune-3-to-5-years-150925012345?src=...),
+# and some listing links carry it as a query parameter instead.
+TRAILING_ID = re.compile(r"-(\d{6,})$")
+ID_PARAMS = ("jobId", "jobid", "jid")
+
+def canonical_job_id(url):
+    """Numeric job ID of a Naukri listing/detail URL, or None if it has none."""
+    parts = urlsplit(url.strip())
+    for key, value in parse_qsl(parts.query):
+        if key in ID_PARAMS and value.isdigit():
+            return int(value)
+    match = TRAILING_ID.search(parts.path.rstrip("/"))
+    return int(match.group(1)) if match else None
+
+def job_key(url):
+    """Dedupe key for a job link: its numeric ID, or the link without query/fragment."""
+    job_id = canonical_job_id(url)
+    if job_id is not None:
+        return job_id
+    parts = urlsplit(url.strip())
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+# ===============================
+# 🔹 COMPACT KEY INDEX
+# ===============================
+
+class JobKeyIndex:
+    """Set of job keys. Numeric IDs live in a sorted array of 8-byte ints
+    (binary-searched) instead of a set of URL strings; recent additions sit in
+    a small set that is merged into the array once it grows."""
+
+    MERGE_AT = 4096
+
+    def __init__(self, keys=()):
+        self._ids = array('q')
+        self._recent = set()
+        self._other = set()
+        for key in keys:
+            self.add(key)
+        self._merge()
+
+    def _merge(self):
+        if self._recent:
+            self._ids = array('q', merge(self._ids, sorted(self._recent)))
+            self._recent.clear()
+
+    def add(self, key):
+        if isinstance(key, int):
+            if key not in self:
+                self._recent.add(key)
+                if len(self._recent) >= self.MERGE_AT:
+                    self._merge()
+        else:
+            self._other.add(key)
+
+    def __contains__(self, key):
+        if not isinstance(key, int):
+            return key in self._other
+        if key in self._recent:
+            return True
+        i = bisect_left(self._ids, key)
+        return i < len(self._ids) and self._ids[i] == key
+
+    def __len__(self):
+        return len(self._ids) + len(self._recent) + len(self._other)
+
+    def add_url(self, url):
+        self.add(job_key(url))
+
+    def has_url(self, url):
+        return job_key(url) in self
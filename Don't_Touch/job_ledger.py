@@ -0,0 +1,343 @@
+import io
+import os
+import csv
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from job_ids import job_key
+from company_index import company_key
+
+# ===============================
+# 🔹 LEDGER LOCATION + STATUSES
+# ===============================
+
+ALREADY_APPLIED_FOLDER = "./Already_applied_folder"
+LEDGER_PATH = os.path.join(ALREADY_APPLIED_FOLDER, "job_ledger.db")
+
+# status -> history CSV it used to live in (and is exported to)
+STATUS_FILES = {
+    "success": "success_applied.csv",
+    "already_applied": "already_applied.csv",
+    "company_site": "company_sites.csv",
+    "expired": "expired_jobs.csv",
+    "manual": "do_manually_apply.csv",
+    "skipped": "skip_jobs.csv",
+}
+COMPANY_LIST_FILE = "company_list.csv"
+# Bytes at the end of a history CSV that must be unchanged for it to count as only appended to
+TAIL_BYTES = 64 * 1024
+CSV_HEADERS = ["Company Name", "Experience", "Location", "Link"]
+
+# When one job shows up with several statuses, the strongest one wins
+STATUS_RANK = {
+    "skipped": 0,
+    "manual": 1,
+    "expired": 2,
+    "company_site": 3,
+    "already_applied": 4,
+    "success": 5,
+}
+
+# job_key has no declared type so numeric job IDs are stored as 8-byte integers;
+# companies are keyed by their normalized name (company_index.company_key);
+# searches hold the watermark of every search URL First_Run.py has scraped
+SCHEMA_VERSION = 3
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key     PRIMARY KEY,
+    link        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    company     TEXT NOT NULL DEFAULT '',
+    experience  TEXT NOT NULL DEFAULT '',
+    location    TEXT NOT NULL DEFAULT '',
+    first_seen  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status);
+CREATE TABLE IF NOT EXISTS companies (
+    company_key TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    added_at    TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS searches (
+    search_key  TEXT PRIMARY KEY,
+    url         TEXT NOT NULL,
+    newest_keys TEXT NOT NULL,
+    last_run_at TEXT NOT NULL,
+    new_jobs    INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+def _link_from_row(row, column_index):
+    if len(row) > column_index and row[column_index].strip().startswith("http"):
+        return row[column_index].strip()
+    for cell in row:
+        if cell.strip().startswith("http"):
+            return cell.strip()
+    return None
+
+# ===============================
+# 🔹 LEDGER
+# ===============================
+
+class JobLedger:
+    """Indexed on-disk record of every job the bots have seen, keyed by canonical job ID.
+
+    Lookups hit the primary-key index, so nothing has to be loaded at startup.
+    One connection is shared by all threads behind a lock.
+    """
+
+    def __init__(self, path=LEDGER_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ---------- jobs ----------
+
+    def status(self, link):
+        with self.lock:
+            row = self.conn.execute("SELECT status FROM jobs WHERE job_key = ?", (job_key(link),)).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, link):
+        return self.status(link) is not None
+
+    def _record(self, link, status, company, experience, location, now):
+        key = job_key(link)
+        row = self.conn.execute("SELECT status FROM jobs WHERE job_key = ?", (key,)).fetchone()
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO jobs (job_key, link, status, company, experience, location, first_seen, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, link.strip(), status, company, experience, location, now, now),
+            )
+            return True
+        if row[0] == status or STATUS_RANK[status] < STATUS_RANK[row[0]]:
+            return False
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, updated_at = ? WHERE job_key = ?",
+            (status, now, key),
+        )
+        return True
+
+    def record(self, link, status, company="", experience="", location=""):
+        """Stores the outcome for a job. Returns False when nothing changed."""
+        with self.lock:
+            return self._record(link, status, company, experience, location, _now())
+
+    # ---------- companies ----------
+
+    def company_keys(self):
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT company_key FROM companies")}
+
+    def _add_company(self, name, now):
+        key = company_key(name)
+        if not key:
+            return False
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO companies (company_key, name, added_at) VALUES (?, ?, ?)", (key, name.strip(), now)
+        )
+        return cursor.rowcount == 1
+
+    def add_company(self, name):
+        """Returns True when no company with the same normalized name was known yet."""
+        with self.lock:
+            return self._add_company(name, _now())
+
+    # ---------- search watermarks ----------
+
+    def search_watermark(self, search_key):
+        """(newest job keys of the search, newest first; when it was last scraped) or ([], None)."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT newest_keys, last_run_at FROM searches WHERE search_key = ?", (search_key,)
+            ).fetchone()
+        if row is None:
+            return [], None
+        return json.loads(row[0]), row[1]
+
+    def save_search_watermark(self, search_key, url, newest_keys, new_jobs):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches (search_key, url, newest_keys, last_run_at, new_jobs) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (search_key, url, json.dumps(list(newest_keys)), _now(), new_jobs),
+            )
+
+    # ---------- CSV import / export ----------
+
+    def _csv_read_from(self, file_path, force):
+        """Byte offset to (re)read a history CSV from, or None if it has not changed since it was last read.
+
+        A file that grew and still ends the old part with the same bytes is taken
+        as appended to and read from where the last import stopped; only that tail
+        is hashed, so startup does not grow with the history. Any other edit
+        re-reads the whole file (recording a job twice is a no-op).
+        """
+        if force:
+            return 0
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (_meta_key(file_path),)).fetchone()
+        if row is None:
+            return 0
+        seen = json.loads(row[0])
+        stat = os.stat(file_path)
+        if (stat.st_mtime_ns, stat.st_size) == (seen["mtime_ns"], seen["size"]):
+            return None
+        if stat.st_size > seen["size"] > 0 and _tail_digest(file_path, seen["size"]) == (seen["tail_sha1"], True):
+            return seen["size"]
+        return 0
+
+    def _remember_csv(self, file_path, size):
+        stat = os.stat(file_path)
+        seen = {"mtime_ns": stat.st_mtime_ns, "size": size, "tail_sha1": _tail_digest(file_path, size)[0]}
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                          (_meta_key(file_path), json.dumps(seen)))
+
+    def import_csv_history(self, folder=ALREADY_APPLIED_FOLDER, force=False):
+        """Imports the history CSVs that changed since they were last read, so hand edits
+        (e.g. links added to skip_jobs.csv) take effect. Returns the number of rows read."""
+        with self.lock:
+            imported = 0
+            now = _now()
+            self.conn.execute("BEGIN")
+            try:
+                for status, file_name in STATUS_FILES.items():
+                    file_path = os.path.join(folder, file_name)
+                    if not os.path.exists(file_path):
+                        continue
+                    offset = self._csv_read_from(file_path, force)
+                    if offset is None:
+                        continue
+                    size = os.path.getsize(file_path)
+                    for row in _read_csv_from(file_path, offset):
+                        link = _link_from_row(row, column_index=3)
+                        if not link:
+                            continue  # header or junk line
+                        company, experience, location = (row + ["", "", ""])[:3]
+                        self._record(link, status, company.strip(), experience.strip(), location.strip(), now)
+                        imported += 1
+                    self._remember_csv(file_path, size)
+
+                company_file = os.path.join(folder, COMPANY_LIST_FILE)
+                offset = self._csv_read_from(company_file, force) if os.path.exists(company_file) else None
+                if offset is not None:
+                    size = os.path.getsize(company_file)
+                    rows = _read_csv_from(company_file, offset)
+                    if offset == 0:
+                        next(rows, None)
+                    for row in rows:
+                        if row:
+                            self._add_company(row[0], now)
+                    self._remember_csv(company_file, size)
+
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return imported
+
+    def export_csv(self, folder=ALREADY_APPLIED_FOLDER):
+        """Writes one CSV per status (plus company_list.csv) from the ledger."""
+        os.makedirs(folder, exist_ok=True)
+        counts = {}
+        with self.lock:
+            for status, file_name in STATUS_FILES.items():
+                rows = self.conn.execute(
+                    "SELECT company, experience, location, link FROM jobs WHERE status = ? ORDER BY first_seen",
+                    (status,),
+                )
+                counts[file_name] = _write_csv(os.path.join(folder, file_name), CSV_HEADERS, rows)
+
+            rows = self.conn.execute("SELECT name FROM companies ORDER BY added_at")
+            counts[COMPANY_LIST_FILE] = _write_csv(os.path.join(folder, COMPANY_LIST_FILE), ["Company Name"], rows)
+
+            # The exported files hold nothing new: no need to read them back on the next start
+            for file_name in list(STATUS_FILES.values()) + [COMPANY_LIST_FILE]:
+                file_path = os.path.join(folder, file_name)
+                self._remember_csv(file_path, os.path.getsize(file_path))
+        return counts
+
+def _meta_key(file_path):
+    return f"csv:{os.path.basename(file_path)}"
+
+def _tail_digest(file_path, size):
+    """SHA-1 of the TAIL_BYTES that end at byte `size`, and whether they end a line."""
+    with open(file_path, 'rb') as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        tail = f.read(min(size, TAIL_BYTES))
+    return hashlib.sha1(tail).hexdigest(), tail.endswith(b"\n")
+
+def _read_csv_from(file_path, offset):
+    """CSV rows from byte `offset` (a line start) to the end of the file."""
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        yield from csv.reader(io.TextIOWrapper(f, encoding='utf-8', newline=''))
+
+def _write_csv(file_path, headers, rows):
+    count = 0
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp_path, file_path)
+    return count
+
+def open_ledger(path=LEDGER_PATH):
+    """Opens the ledger and reads in whatever changed in the history CSVs since the last run."""
+    ledger = JobLedger(path)
+    imported = ledger.import_csv_history()
+    if imported:
+        logging.info(f"📥 Read {imported} new or edited rows from the history CSVs into {path}")
+    return ledger
+
+# ===============================
+# 🔹 COMMAND LINE
+# ===============================
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Maintain the job ledger (Already_applied_folder/job_ledger.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_cmd = sub.add_parser("import", help="import the history CSVs into the ledger")
+    import_cmd.add_argument("--folder", default=ALREADY_APPLIED_FOLDER)
+    export_cmd = sub.add_parser("export", help="write the ledger back out as the familiar CSV files")
+    export_cmd.add_argument("--folder", default=ALREADY_APPLIED_FOLDER)
+    args = parser.parse_args()
+
+    ledger = JobLedger()
+    try:
+        if args.command == "import":
+            logging.info(f"Imported {ledger.import_csv_history(args.folder, force=True)} rows")
+        else:
+            for file_name, count in ledger.export_csv(args.folder).items():
+                logging.info(f"  {file_name}: {count} rows")
+    finally:
+        ledger.close()
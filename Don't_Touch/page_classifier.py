@@ -0,0 +1,120 @@
+import time
+from lxml import html as lxml_html
+
+# ===============================
+# 🔹 JOB PAGE STATES
+# ===============================
+
+EXPIRED = "expired"
+ALREADY_APPLIED = "already_applied"
+COMPANY_SITE = "company_site"
+APPLYABLE = "applyable"
+UNKNOWN = "unknown"
+
+CLASSIFY_TIMEOUT = 10      # seconds to wait for any terminal state
+APPLY_SETTLE_MS = 300      # grace period for a stronger marker once Apply shows up
+
+# ===============================
+# 🔹 IN-PAGE CLASSIFIER
+# ===============================
+
+# Runs once inside the page. Checks the same markers Second_Run.py used to probe
+# one by one, in the same priority order, and resolves as soon as one of them is
+# present. A MutationObserver re-checks on every DOM change so nothing waits on
+# a fixed sleep. "Apply" alone is held for a short settle window because the
+# already-applied / company-site markers can render a moment after it.
+CLASSIFY_JS = """
+var timeoutMs = arguments[0];
+var settleMs = arguments[1];
+var done = arguments[arguments.length - 1];
+var started = performance.now();
+var finished = false;
+var settleTimer = null;
+var observer = null;
+var timeoutTimer = null;
+
+function strongState() {
+    var alert = document.querySelector('.styles_alert-message-text__QwDRi');
+    if (alert && alert.textContent.toLowerCase().indexOf('expired') !== -1) return 'expired';
+    if (document.getElementById('already-applied')) return 'already_applied';
+    if (document.getElementById('company-site-button')) return 'company_site';
+    return null;
+}
+
+function hasApply() {
+    return document.evaluate("//*[text()='Apply']", document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;
+}
+
+function finish(state) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timeoutTimer);
+    clearTimeout(settleTimer);
+    done({state: state, elapsed: performance.now() - started});
+}
+
+function check() {
+    var state = strongState();
+    if (state) { finish(state); return; }
+    if (settleTimer === null && hasApply()) {
+        settleTimer = setTimeout(function () {
+            finish(strongState() || 'applyable');
+        }, settleMs);
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    timeoutTimer = setTimeout(function () {
+        finish(strongState() || (hasApply() ? 'applyable' : 'unknown'));
+    }, timeoutMs);
+}
+"""
+
+def prepare_driver(driver, timeout=CLASSIFY_TIMEOUT):
+    """Gives the async classifier enough script time; call once per driver."""
+    driver.set_script_timeout(timeout + 5)
+
+def classify_job_page(driver, timeout=CLASSIFY_TIMEOUT):
+    """Returns (state, milliseconds) for the job page currently loaded in driver."""
+    started = time.perf_counter()
+    result = driver.execute_async_script(CLASSIFY_JS, int(timeout * 1000), APPLY_SETTLE_MS)
+    if not result:
+        return UNKNOWN, (time.perf_counter() - started) * 1000
+    return result["state"], result["elapsed"]
+
+async def classify_tab(tab, timeout=CLASSIFY_TIMEOUT):
+    """classify_job_page() for a bidi_tabs.BiDiTab."""
+    started = time.perf_counter()
+    result = await tab.execute_async_script(CLASSIFY_JS, int(timeout * 1000), APPLY_SETTLE_MS, timeout=timeout + 5)
+    if not result:
+        return UNKNOWN, (time.perf_counter() - started) * 1000
+    return result["state"], result["elapsed"]
+
+# ===============================
+# 🔹 STATIC HTML CLASSIFIER
+# ===============================
+
+# The same markers and priority as CLASSIFY_JS, for a job page fetched without a browser
+EXPIRED_ALERT_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' styles_alert-message-text__QwDRi ')]"
+ALREADY_APPLIED_XPATH = "//*[@id='already-applied']"
+COMPANY_SITE_XPATH = "//*[@id='company-site-button']"
+APPLY_XPATH = "//*[text()='Apply']"
+
+def classify_html(page_html):
+    """State of a job page from its raw HTML. UNKNOWN when no marker is there yet
+    (the page renders them by script), so only a browser can tell."""
+    tree = lxml_html.fromstring(page_html)
+    if any("expired" in alert.text_content().lower() for alert in tree.xpath(EXPIRED_ALERT_XPATH)):
+        return EXPIRED
+    if tree.xpath(ALREADY_APPLIED_XPATH):
+        return ALREADY_APPLIED
+    if tree.xpath(COMPANY_SITE_XPATH):
+        return COMPANY_SITE
+    if tree.xpath(APPLY_XPATH):
+        return APPLYABLE
+    return UNKNOWN
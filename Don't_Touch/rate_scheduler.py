@@ -0,0 +1,151 @@
+import time
+import logging
+import threading
+from selenium.common.exceptions import TimeoutException
+
+# ===============================
+# 🔹 THROTTLE SIGNALS
+# ===============================
+
+# HTTP statuses the site answers with when it wants us to slow down
+THROTTLE_STATUSES = (403, 429, 503)
+
+# Text of captcha / bot-check / rate-limit interstitials (lower case)
+THROTTLE_MARKERS = (
+    "captcha", "are you a robot", "unusual traffic", "too many requests",
+    "access denied", "request blocked", "verify you are human",
+)
+
+# Looks at the loaded page for an error status or an interstitial; returns the reason or null
+THROTTLE_JS = """
+var markers = arguments[0];
+var nav = performance.getEntriesByType('navigation')[0];
+if (nav && nav.responseStatus && arguments[1].indexOf(nav.responseStatus) !== -1) {
+    return 'HTTP ' + nav.responseStatus;
+}
+if (document.querySelector("iframe[src*='recaptcha'], iframe[src*='hcaptcha'], iframe[src*='turnstile']")) {
+    return 'captcha frame';
+}
+var text = ((document.title || '') + ' ' + (document.body ? document.body.innerText.slice(0, 3000) : '')).toLowerCase();
+for (var i = 0; i < markers.length; i++) {
+    if (text.indexOf(markers[i]) !== -1) return 'page says "' + markers[i] + '"';
+}
+return null;
+"""
+
+def page_throttle_reason(driver):
+    """Reason the page in the browser looks like a throttle / captcha page, or None."""
+    try:
+        return driver.execute_script(THROTTLE_JS, list(THROTTLE_MARKERS), list(THROTTLE_STATUSES))
+    except Exception:
+        return None
+
+async def tab_throttle_reason(tab):
+    """page_throttle_reason() for a bidi_tabs.BiDiTab."""
+    try:
+        return await tab.execute_script(THROTTLE_JS, list(THROTTLE_MARKERS), list(THROTTLE_STATUSES))
+    except Exception:
+        return None
+
+def response_throttle_reason(response):
+    """Same check for a requests response (HTTP engine)."""
+    if response.status_code in THROTTLE_STATUSES:
+        return f"HTTP {response.status_code}"
+    head = response.text[:5000].lower()
+    for marker in THROTTLE_MARKERS:
+        if marker in head:
+            return f'page says "{marker}"'
+    return None
+
+class ThrottledError(Exception):
+    """The site showed a throttle / captcha page instead of the job."""
+
+# ===============================
+# 🔹 RATE SCHEDULER
+# ===============================
+
+class RateScheduler:
+    """Token bucket for page navigations with AIMD rate control, shared by all threads.
+
+    Every healthy navigation raises the rate a little (additive increase), a
+    throttle signal halves it and pauses everyone for a cool-down
+    (multiplicative decrease), and a load far slower than usual trims it.
+    """
+
+    def __init__(self, rate=0.5, min_rate=1 / 30, max_rate=2.0, increase=0.02, decrease=0.5,
+                 cooldown=60, max_cooldown=900, slow_factor=3.0, name="navigation"):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.slow_factor = slow_factor
+        self.name = name
+
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+        self.paused_until = 0.0
+        self.cooldown = cooldown
+        self.avg_latency = None
+        self.throttles = 0
+
+    def acquire(self):
+        """Blocks until this thread may start the next navigation."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_slot, self.paused_until)
+            self.next_slot = start + 1 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def on_success(self, latency=None):
+        """A page loaded normally in `latency` seconds (None when the load time is unknown)."""
+        with self.lock:
+            if latency is not None:
+                slow = self.avg_latency is not None and latency > max(self.slow_factor * self.avg_latency, 5.0)
+                self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+                if slow:
+                    self._set_rate(self.rate * 0.75, f"slow load {latency:.1f}s vs usual {self.avg_latency:.1f}s")
+                    return
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            # Healthy again: the next throttle starts from the short cool-down
+            self.cooldown = self.base_cooldown
+
+    def on_timeout(self):
+        """A page did not finish loading in time."""
+        with self.lock:
+            self._set_rate(self.rate * 0.75, "page load timed out")
+
+    def on_throttle(self, reason):
+        """The site pushed back: slow down and pause every thread for a while."""
+        with self.lock:
+            self.throttles += 1
+            self._set_rate(self.rate * self.decrease, reason)
+            self.paused_until = max(self.paused_until, time.monotonic() + self.cooldown)
+            logging.warning(f"🐢 Throttled ({reason}), pausing {self.name}s for {self.cooldown:.0f}s")
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+
+    def _set_rate(self, rate, reason):
+        self.rate = max(self.min_rate, rate)
+        logging.info(f"⏬ {self.name} rate {self.rate * 60:.1f}/min ({reason})")
+
+    def describe(self):
+        return f"{self.rate * 60:.1f} {self.name}s/min, {self.throttles} throttle(s)"
+
+def paced_get(driver, scheduler, url, timer, phase="load"):
+    """driver.get() once the scheduler allows it. Returns the load time in seconds.
+
+    The wait for the scheduler is timed as "pace", the load itself as `phase`.
+    """
+    with timer.phase("pace"):
+        scheduler.acquire()
+    started = time.perf_counter()
+    with timer.phase(phase):
+        try:
+            driver.get(url)
+        except TimeoutException:
+            scheduler.on_timeout()
+            raise
+    return time.perf_counter() - started
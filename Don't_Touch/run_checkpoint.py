@@ -0,0 +1,138 @@
+import os
+import csv
+import json
+import hashlib
+import threading
+
+# ===============================
+# 🔹 CSV ROWS WITH BYTE OFFSETS
+# ===============================
+
+def iter_csv_rows(csv_path, start_offset=0):
+    """Yields (start, end, row_dict) for every data row at or after start_offset.
+
+    start/end are byte offsets into the file, so a later run can seek straight
+    back to any row without re-reading the rows before it.
+    """
+    with open(csv_path, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+        if start_offset > f.tell():
+            f.seek(start_offset)
+        consumed = f.tell()
+
+        def lines():
+            nonlocal consumed
+            for raw in iter(f.readline, b''):
+                consumed += len(raw)
+                yield raw.decode('utf-8')
+
+        # csv.reader pulls exactly the lines it needs for one record, so
+        # `consumed` is the end of the row that was just returned
+        row_start = consumed
+        for row in csv.reader(lines()):
+            if row:
+                yield row_start, consumed, dict(zip(header, row))
+            row_start = consumed
+
+def read_csv_row(csv_path, offset):
+    for start, end, row in iter_csv_rows(csv_path, offset):
+        return start, end, row
+    return None
+
+def _fingerprint(csv_path, length):
+    with open(csv_path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+# ===============================
+# 🔹 CHECKPOINT
+# ===============================
+
+FINGERPRINT_BYTES = 4096
+
+class RunCheckpoint:
+    """Durable progress marker for one jobs CSV.
+
+    Rows are tracked by byte offset. `resume_offset` is the first row that has
+    not finished (in-flight rows included), `done` holds rows beyond it that
+    already finished out of order, and `retry` holds rows whose processing
+    raised. Every change is written with an atomic rename.
+    """
+
+    def __init__(self, csv_path, path=None):
+        self.csv_path = csv_path
+        self.path = path or csv_path + ".checkpoint.json"
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.done = set()
+        self.retry = set()
+        self.next_offset = 0
+        self.line_no = 0
+
+    @property
+    def resume_offset(self):
+        return min(self.pending) if self.pending else self.next_offset
+
+    def load(self):
+        """Restores the saved state. Returns False if there is none or jobs.csv changed underneath it."""
+        if not os.path.exists(self.path) or not os.path.exists(self.csv_path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        resume = state["resume_offset"]
+        length = state["fingerprint_bytes"]
+        if os.path.getsize(self.csv_path) < resume or _fingerprint(self.csv_path, length) != state["fingerprint"]:
+            return False
+
+        self.next_offset = resume
+        self.done = set(state["done"])
+        self.retry = set(state["retry"])
+        self.line_no = state.get("line_no", 0)
+        return True
+
+    def is_done(self, offset):
+        return offset in self.done
+
+    def dispatched(self, start, end):
+        with self.lock:
+            if start in self.retry:
+                return  # stays a retry row until it finishes
+            self.pending.add(start)
+            self.next_offset = max(self.next_offset, end)
+
+    def finished(self, start, line_no):
+        with self.lock:
+            self.pending.discard(start)
+            self.retry.discard(start)
+            self.done.add(start)
+            self.line_no = line_no
+            self._save()
+
+    def failed(self, start, line_no):
+        with self.lock:
+            self.pending.discard(start)
+            self.retry.add(start)
+            self.line_no = line_no
+            self._save()
+
+    def _save(self):
+        resume = self.resume_offset
+        self.done = {offset for offset in self.done if offset >= resume}
+        length = min(FINGERPRINT_BYTES, resume)
+        state = {
+            "csv": os.path.abspath(self.csv_path),
+            "resume_offset": resume,
+            "in_flight": sorted(self.pending),
+            "done": sorted(self.done),
+            "retry": sorted(self.retry),
+            "line_no": self.line_no,
+            "fingerprint_bytes": length,
+            "fingerprint": _fingerprint(self.csv_path, length),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,136 @@
+import os
+import math
+import json
+import time
+import logging
+import threading
+from collections import deque, Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+# ===============================
+# 🔹 PHASE TIMING
+# ===============================
+
+METRICS_FOLDER = os.path.join("Delete_me", "metrics")
+
+class PhaseTimer:
+    """Collects how long each phase of one job (or result page) took, in ms."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name, ms):
+        self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+# ===============================
+# 🔹 RUN METRICS
+# ===============================
+
+class RunMetrics:
+    """Writes one JSON line per job/page and keeps rolling throughput and phase percentiles.
+
+    record() is thread-safe. A progress line (rate over the last `window`
+    seconds plus p50/p95 per phase) is logged every `report_every` seconds.
+    `started` (time.monotonic()) is when the run began, for the time to the
+    first job; it defaults to now.
+    """
+
+    def __init__(self, kind, unit="jobs", report_every=60, window=300, folder=METRICS_FOLDER, started=None):
+        os.makedirs(folder, exist_ok=True)
+        self.kind = kind
+        self.unit = unit
+        self.report_every = report_every
+        self.window = window
+        self.path = os.path.join(folder, f"{kind}_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.jsonl")
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.lock = threading.Lock()
+        self.started = started if started is not None else time.monotonic()
+        self.first_after = None
+        self.last_report = self.started
+        self.recent = deque()
+        self.samples = defaultdict(list)
+        self.outcomes = Counter()
+        self.count = 0
+
+    def record(self, item, outcome, timer, **extra):
+        total_ms = timer.total_ms()
+        line = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "kind": self.kind,
+            "item": item,
+            "outcome": outcome,
+            "total_ms": round(total_ms, 1),
+            "phases_ms": {name: round(ms, 1) for name, ms in timer.phases.items()},
+        }
+        line.update(extra)
+        now = time.monotonic()
+        with self.lock:
+            self.file.write(json.dumps(line) + "\n")
+            self.count += 1
+            if self.first_after is None:
+                self.first_after = now - self.started
+                logging.info(f"⏱️ First {self.unit.rstrip('s')} done {self.first_after:.1f}s after start")
+            self.outcomes[outcome] += 1
+            self.recent.append(now)
+            self.samples["total"].append(total_ms)
+            for name, ms in timer.phases.items():
+                self.samples[name].append(ms)
+            if now - self.last_report >= self.report_every:
+                self.last_report = now
+                self.file.flush()
+                logging.info(f"📈 {self._rate_line(now)} | {self._phase_line()}")
+
+    def _rate_line(self, now):
+        while self.recent and now - self.recent[0] > self.window:
+            self.recent.popleft()
+        span = min(self.window, now - self.started) or 1
+        return f"{len(self.recent) * 60 / span:.1f} {self.unit}/min (last {span / 60:.0f} min)"
+
+    def _phase_line(self):
+        parts = []
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            parts.append(f"{name} p50 {percentile(ordered, 50):.0f} / p95 {percentile(ordered, 95):.0f} ms")
+        return ", ".join(parts)
+
+    def summary(self):
+        """Logs the end-of-run summary and closes the JSON-lines file."""
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.close()
+            elapsed = time.monotonic() - self.started
+            logging.info(f"📊 {self.kind} metrics → {self.count} {self.unit} in {elapsed:.0f}s "
+                         f"({self.count * 60 / (elapsed or 1):.1f} {self.unit}/min), details in {self.path}")
+            if self.first_after is not None:
+                logging.info(f"  time to first {self.unit.rstrip('s')}: {self.first_after:.1f}s")
+            if self.outcomes:
+                logging.info("  outcomes: " + ", ".join(f"{name} {count}" for name, count in self.outcomes.most_common()))
+            total_time = sum(self.samples["total"]) or 1
+            for name, values in self.samples.items():
+                if not values:
+                    continue
+                ordered = sorted(values)
+                share = "" if name == "total" else f", {100 * sum(values) / total_time:.0f}% of time"
+                logging.info(f"  {name:12} p50 {percentile(ordered, 50):7.0f} ms  p95 {percentile(ordered, 95):7.0f} ms  "
+                             f"mean {sum(values) / len(values):7.0f} ms{share}")
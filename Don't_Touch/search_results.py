@@ -0,0 +1,207 @@
+import re
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from run_metrics import PhaseTimer
+from rate_scheduler import RateScheduler, paced_get, page_throttle_reason
+
+# ===============================
+# 🔹 SEARCH RESULT EXTRACTION
+# ===============================
+
+# Collects every job tuple (and the Next link) on the current results page in
+# a single WebDriver call. Selectors mirror the per-element lookups First_Run.py
+# used to make: a missing company/location element is reported as null (the job
+# is dropped), a missing experience element falls back to "Not Available".
+EXTRACT_PAGE_JS = """
+function textOf(root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+}
+var records = [];
+document.querySelectorAll('div.srp-jobtuple-wrapper a.title').forEach(function (link) {
+    var wrapper = link.closest('div.srp-jobtuple-wrapper');
+    records.push({
+        title: link.innerText.trim(),
+        link: link.href,
+        company: textOf(wrapper, "a[class*='comp-name']"),
+        location: textOf(wrapper, "span[class*='locWdth']"),
+        experience: textOf(wrapper, "span[class*='expwdth']")
+    });
+});
+var next = document.evaluate(
+    "//a[contains(@class, 'styles_btn-secondary__2AsIP') and span[contains(text(), 'Next')]]",
+    document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return {records: records, next: next ? next.href : null};
+"""
+
+def extract_results_page(driver):
+    """Returns (records, next_link) for the loaded page.
+
+    records holds one dict per job tuple (title, link, company, experience,
+    location); next_link is the href of the "Next" button, or None.
+    """
+    page = driver.execute_script(EXTRACT_PAGE_JS) or {}
+    return page.get("records") or [], page.get("next") or None
+
+# ===============================
+# 🔹 PAGINATION
+# ===============================
+
+# Naukri numbers result pages with a "-<n>" suffix on the last path segment
+# (python-jobs, python-jobs-2, ...); some searches use a pageNo query parameter.
+PAGE_SUFFIX = re.compile(r"-(\d+)$")
+
+def page_number(url):
+    parts = urlsplit(url)
+    for key, value in parse_qsl(parts.query):
+        if key == "pageNo" and value.isdigit():
+            return int(value)
+    match = PAGE_SUFFIX.search(parts.path.rstrip("/"))
+    return int(match.group(1)) if match else 1
+
+def page_url(url, page):
+    """URL of result page `page` for the search that `url` belongs to."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if any(key == "pageNo" for key, _ in query):
+        query = [(key, str(page) if key == "pageNo" else value) for key, value in query]
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    head, _, slug = parts.path.rstrip("/").rpartition("/")
+    slug = PAGE_SUFFIX.sub("", slug)
+    if page > 1:
+        slug = f"{slug}-{page}"
+    return urlunsplit(parts._replace(path=f"{head}/{slug}"))
+
+# Naukri's "Sort by: Date" option; newest postings come first
+FRESHNESS_SORT = ("sort", "f")
+
+def fresh_first_url(url):
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != FRESHNESS_SORT[0]]
+    query.append(FRESHNESS_SORT)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def sorted_by_date(url):
+    """True when the results come newest first, so known jobs at the top mean nothing new below."""
+    return FRESHNESS_SORT in parse_qsl(urlsplit(url).query)
+
+def search_key(url):
+    """Identifies a saved search regardless of result page and sort order."""
+    parts = urlsplit(page_url(url, 1))
+    query = sorted((key, value) for key, value in parse_qsl(parts.query)
+                   if key not in ("pageNo", FRESHNESS_SORT[0]))
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/').lower()}?{urlencode(query)}"
+
+def same_page(a, b):
+    a, b = urlsplit(a), urlsplit(b)
+    return (a.netloc, a.path.rstrip("/"), sorted(parse_qsl(a.query))) == \
+           (b.netloc, b.path.rstrip("/"), sorted(parse_qsl(b.query)))
+
+# ===============================
+# 🔹 BROWSER PAGE ITERATION
+# ===============================
+
+OPEN_TAB_JS = "window.open(arguments[0], '_blank');"
+
+def load_results_page(driver, waits, timer):
+    """Waits for the tuples on the current tab, then extracts them; ([], None) if none show up.
+
+    waits is an adaptive_wait.AdaptiveWaits, so the timeout follows how fast result pages usually render.
+    """
+    try:
+        with timer.phase("load"):
+            waits.until(driver, "results", EC.presence_of_all_elements_located((By.CLASS_NAME, "srp-jobtuple-wrapper")))
+    except TimeoutException:
+        return [], None
+    with timer.phase("extract"):
+        return extract_results_page(driver)
+
+def _load_checked(driver, waits, scheduler, url, timer, latency):
+    """load_results_page() that reports to the scheduler and reloads once after a throttle page."""
+    records, next_link = load_results_page(driver, waits, timer)
+    if records:
+        scheduler.on_success(latency)
+        return records, next_link
+    reason = page_throttle_reason(driver)
+    if not reason:
+        return records, next_link
+    scheduler.on_throttle(reason)
+    latency = paced_get(driver, scheduler, url, timer)
+    records, next_link = load_results_page(driver, waits, timer)
+    if records:
+        scheduler.on_success(latency)
+    return records, next_link
+
+def _open_tab(driver, url):
+    # window.open returns at once, so the page loads while we work on another tab
+    before = set(driver.window_handles)
+    driver.execute_script(OPEN_TAB_JS, url)
+    opened = [handle for handle in driver.window_handles if handle not in before]
+    if not opened:
+        raise WebDriverException(f"Could not open a tab for {url}")
+    return opened[0]
+
+def iter_browser_pages(driver, waits, url, prefetch=0, scheduler=None):
+    """Yields (page_url, records, timer) in page order until the results run out.
+
+    timer holds the page's "load" and "extract" times. With prefetch > 0 (and a recognised page-numbering scheme) the next
+    `prefetch` pages load in background tabs while the current one is scraped.
+    Closing the generator closes every tab that is still loading. Every page
+    load (and tab opened) waits for the rate scheduler.
+    """
+    scheduler = scheduler or RateScheduler(name="result page")
+    timer = PhaseTimer()
+    latency = paced_get(driver, scheduler, url, timer)
+    records, next_link = _load_checked(driver, waits, scheduler, url, timer, latency)
+    yield url, records, timer
+    if not records or not next_link:
+        return
+
+    start = page_number(url)
+    if prefetch < 1 or not same_page(next_link, page_url(url, start + 1)):
+        while next_link:
+            current = next_link
+            timer = PhaseTimer()
+            latency = paced_get(driver, scheduler, current, timer)
+            records, next_link = _load_checked(driver, waits, scheduler, current, timer, latency)
+            yield current, records, timer
+            if not records:
+                return
+        return
+
+    home = driver.current_window_handle
+    pending = deque()
+    page = start + 1
+    try:
+        while True:
+            while len(pending) < prefetch:
+                target = page_url(url, page)
+                scheduler.acquire()
+                pending.append((target, _open_tab(driver, target)))
+                page += 1
+            current, handle = pending.popleft()
+            timer = PhaseTimer()
+            driver.switch_to.window(handle)
+            # Only what is left of the background load is waited for here (its
+            # real load time is unknown, so it does not feed the slow-load check)
+            records, next_link = _load_checked(driver, waits, scheduler, current, timer, None)
+            driver.close()
+            driver.switch_to.window(home)
+            yield current, records, timer
+            if not records or not next_link:
+                return
+    finally:
+        for _, handle in pending:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except WebDriverException:
+                pass
+        try:
+            driver.switch_to.window(home)
+        except WebDriverException:
+            pass
@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import tempfile
+import requests
+from http_scraper import HEADERS
+
+# ===============================
+# 🔹 SESSION COOKIES
+# ===============================
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cookies of the last successful login, for stages that run on a fresh or copied profile
+COOKIE_FILE = os.path.join(SCRIPT_DIR, "naukri_cookies.json")
+
+NAUKRI_DOMAIN = "naukri.com"
+# Naukri keeps the login in these cookies; without one of them the session is gone
+AUTH_COOKIES = ("nauk_at", "nauk_rt", "nauk_sid")
+
+# Logged-in users get the page, everyone else is redirected to the login page
+PROBE_URL = "https://www.naukri.com/mnjuser/homepage"
+PROBE_TIMEOUT = 10
+# Only a logged-in page has these: the user drawer (Login.py waits for its icon) and the profile link
+LOGGED_IN_MARKERS = ("nI-gNb-drawer", "/mnjuser/profile")
+# Cheap page on the Naukri domain, needed before Selenium accepts cookies for it
+COOKIE_LANDING_URL = "https://www.naukri.com/robots.txt"
+
+def _expiry_seconds(expiry):
+    # Newer Firefox versions store cookie expiry in milliseconds
+    return expiry / 1000 if expiry and expiry > 10 ** 11 else expiry
+
+def _is_live(cookie, now):
+    expiry = cookie.get("expiry")
+    return not expiry or _expiry_seconds(expiry) > now
+
+def profile_cookies(profile_path):
+    """Naukri cookies from the profile's cookies.sqlite (read from a copy, Firefox may hold a lock)."""
+    source = os.path.join(profile_path, "cookies.sqlite")
+    if not os.path.exists(source):
+        return []
+
+    tmp_dir = tempfile.mkdtemp(prefix="naukri_cookies_")
+    try:
+        for suffix in ("", "-wal"):
+            if os.path.exists(source + suffix):
+                shutil.copy2(source + suffix, os.path.join(tmp_dir, "cookies.sqlite" + suffix))
+        conn = sqlite3.connect(os.path.join(tmp_dir, "cookies.sqlite"))
+        try:
+            rows = conn.execute(
+                "SELECT name, value, host, path, expiry, isSecure FROM moz_cookies WHERE host LIKE ?",
+                (f"%{NAUKRI_DOMAIN}",),
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logging.warning(f"Could not read {source}: {e}")
+        return []
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return [
+        {"name": name, "value": value, "domain": host, "path": path,
+         "expiry": int(_expiry_seconds(expiry)) if expiry else None, "secure": bool(secure)}
+        for name, value, host, path, expiry, secure in rows
+    ]
+
+def load_saved_cookies():
+    try:
+        with open(COOKIE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get("cookies", [])
+    except (OSError, ValueError):
+        return []
+
+def save_cookies(cookies):
+    tmp_path = COOKIE_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"saved_at": int(time.time()), "cookies": cookies}, f)
+    os.replace(tmp_path, COOKIE_FILE)
+
+def save_driver_cookies(driver):
+    """Persists the cookies of a freshly logged-in browser (must be on a Naukri page)."""
+    cookies = [c for c in driver.get_cookies() if NAUKRI_DOMAIN in c.get("domain", "")]
+    if any(c["name"] in AUTH_COOKIES for c in cookies):
+        save_cookies(cookies)
+        return True
+    return False
+
+def restore_cookies(driver, cookies=None):
+    """Loads the saved login into a browser running on a fresh or copied profile."""
+    now = time.time()
+    cookies = [c for c in (cookies if cookies is not None else load_saved_cookies()) if _is_live(c, now)]
+    if not any(c["name"] in AUTH_COOKIES for c in cookies):
+        return False
+
+    driver.get(COOKIE_LANDING_URL)
+    for cookie in cookies:
+        cookie = {key: value for key, value in cookie.items() if value is not None}
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logging.debug(f"Cookie {cookie['name']} not restored: {e}")
+    return True
+
+# ===============================
+# 🔹 SESSION PROBE
+# ===============================
+
+def add_cookies(session, cookies):
+    """Puts browser-style cookie dicts into a requests session."""
+    for cookie in cookies:
+        session.cookies.set(cookie["name"], cookie["value"],
+                            domain=cookie.get("domain") or NAUKRI_DOMAIN, path=cookie.get("path") or "/")
+
+def probe_session(cookies):
+    """One HTTP request with the given cookies: True = logged in, False = not, None = could not tell."""
+    session = requests.Session()
+    add_cookies(session, cookies)
+    try:
+        response = session.get(PROBE_URL, headers=HEADERS, timeout=PROBE_TIMEOUT, allow_redirects=False)
+    except requests.RequestException as e:
+        logging.warning(f"Session probe failed: {e}")
+        return None
+    finally:
+        session.close()
+
+    if response.status_code in (301, 302, 303, 307, 308, 401, 403):
+        return False
+    if response.status_code == 200 and any(marker in response.text for marker in LOGGED_IN_MARKERS):
+        return True
+    logging.warning(f"Session probe got HTTP {response.status_code} without the logged-in page")
+    return None
+
+def session_is_valid(profile_path=None):
+    """Cheap check whether the Naukri login is still good, without starting Firefox.
+
+    Looks at the auth cookies of the profile (or of the saved cookie file when no
+    profile is given): a missing or expired one means logged out, otherwise a
+    single request to the homepage decides. Only a page that shows the logged-in
+    user counts; when the probe cannot tell, the session is treated as gone so
+    the real login runs.
+    """
+    now = time.time()
+    cookies = profile_cookies(profile_path) if profile_path else load_saved_cookies()
+    live = [c for c in cookies if _is_live(c, now)]
+    if not any(c["name"] in AUTH_COOKIES for c in live):
+        return False
+
+    valid = probe_session(live)
+    if valid is None:
+        logging.info("Session probe inconclusive, logging in to be sure")
+        return False
+    if valid and profile_path:
+        # Refresh the saved copy for profile copies and fresh browsers
+        save_cookies(live)
+    return valid
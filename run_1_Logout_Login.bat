@@ -3,14 +3,10 @@ REM --- Always run from current folder (where bat file is placed) ---
 cd /d "%~dp0"
 
 echo ===================================
-echo    Logging out from Naukri.com
+echo    Checking Naukri.com session
 echo ===================================
-python "Don't_Touch\Logout.py"
-
-echo ===================================
-echo    Logging in to Naukri.com
-echo ===================================
-python "Don't_Touch\Login.py"
+REM Logs in only when the saved session has expired (add --force to always log in again)
+python "Don't_Touch\browser_daemon.py" login
 
 echo ===================================
 echo    Done!
@@ -3,9 +3,9 @@ REM --- Always run from current folder (where bat file is placed) ---
 cd /d "%~dp0"
 
 echo ===================================
-echo   🚀 Running First_Run.py
+echo   🚀 Scraping jobs (First_Run.py)
 echo ===================================
-python "Don't_Touch\First_Run.py"
+python "Don't_Touch\browser_daemon.py" scrape
 
 echo ===================================
 echo   ✅ Done!
@@ -3,9 +3,14 @@ REM --- Always run from current folder (where bat file is placed) ---
 cd /d "%~dp0"
 
 echo ===================================
-echo   Running Second_Run.py
+echo   Sorting out expired / company-site jobs (Triage.py)
 echo ===================================
-python "Don't_Touch\Second_Run.py"
+python "Don't_Touch\Triage.py"
+
+echo ===================================
+echo   Applying to jobs (Second_Run.py)
+echo ===================================
+python "Don't_Touch\browser_daemon.py" apply --csv "Delete_me\jobs_to_apply.csv"
 
 echo ===================================
 echo   ✅ Done!
@@ -5,7 +5,7 @@ cd /d "%~dp0"
 echo ===================================
 echo    Logging In from Naukri.com
 echo ===================================
-python "Don't_Touch\Login.py"
+python "Don't_Touch\browser_daemon.py" login
 
 
 echo ===================================
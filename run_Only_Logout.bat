@@ -5,7 +5,7 @@ cd /d "%~dp0"
 echo ===================================
 echo    Logging out from Naukri.com
 echo ===================================
-python "Don't_Touch\Logout.py"
+python "Don't_Touch\browser_daemon.py" logout
 
 
 echo ===================================
@@ -0,0 +1,14 @@
+@echo off
+REM --- Always run from current folder (where bat file is placed) ---
+cd /d "%~dp0"
+
+echo ===================================
+echo    Closing the background browsers
+echo ===================================
+python "Don't_Touch\browser_daemon.py" stop
+
+
+echo ===================================
+echo    Done!
+echo ===================================
+pause